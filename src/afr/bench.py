@@ -0,0 +1,193 @@
+"""Deterministic 3D pipeline benchmark (`afr bench`)."""
+
+from __future__ import annotations
+
+import json
+import math
+import platform
+import statistics
+import time
+from pathlib import Path
+
+import pygame
+
+BENCH_VERSION = 1
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def frame_stats(times_s: list[float]) -> dict:
+    ms = sorted(t * 1000.0 for t in times_s)
+    return {
+        "n": len(ms),
+        "min_ms": ms[0] if ms else 0.0,
+        "median_ms": statistics.median(ms) if ms else 0.0,
+        "mean_ms": statistics.fmean(ms) if ms else 0.0,
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+    }
+
+
+def run_bench(
+    app_state,
+    paths: dict[str, list],
+    size: tuple[int, int],
+    *,
+    warmup: int = 1,
+    iterations: int = 3,
+    fps: float = 30.0,
+) -> dict:
+    from afr import pipeline_stats
+    from afr.camera_path import apply_pose
+    from afr.draw import draw
+
+    surface = pygame.Surface(size, flags=pygame.SRCALPHA, depth=32)
+    per_path: dict[str, list[float]] = {name: [] for name in paths}
+    stages: dict[str, float] = {}
+    timed_frames = 0
+    # Pipeline counters are collected on the first (untimed) warmup pass only.
+    counts: dict[str, int] = {}
+    counted_frames = 0
+
+    for it in range(warmup + iterations):
+        timed = it >= warmup
+        pstats = pipeline_stats.PipelineStats() if it == 0 and warmup > 0 else None
+        pipeline_stats.STATS = pstats
+        for name, poses in paths.items():
+            for i, pose in enumerate(poses):
+                apply_pose(app_state, pose)
+                frame_stages: dict[str, float] = {}
+                t0 = time.perf_counter()
+                surface.fill((0, 0, 0, 255))
+                draw(surface, app_state, t=i / fps, timings=frame_stages)
+                dt = time.perf_counter() - t0
+                if timed:
+                    per_path[name].append(dt)
+                    timed_frames += 1
+                    for k, v in frame_stages.items():
+                        stages[k] = stages.get(k, 0.0) + v
+                if pstats is not None:
+                    counted_frames += 1
+                    for k, v in pstats.counts().items():
+                        counts[k] = counts.get(k, 0) + v
+    pipeline_stats.STATS = None
+
+    all_times = [t for times in per_path.values() for t in times]
+    return {
+        "version": BENCH_VERSION,
+        "config": {
+            "paths": list(paths),
+            "frames_per_path": max((len(p) for p in paths.values()), default=0),
+            "warmup": warmup,
+            "iterations": iterations,
+            "size": list(size),
+            "fps": fps,
+        },
+        "env": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+        },
+        "frames": {
+            "all": frame_stats(all_times),
+            "per_path": {name: frame_stats(times) for name, times in per_path.items()},
+        },
+        "stages_ms": {k: v * 1000.0 / max(1, timed_frames) for k, v in stages.items()},
+        "pipeline_per_frame": {k: v / counted_frames for k, v in counts.items()},
+    }
+
+
+def _fmt_stats(label: str, st: dict) -> str:
+    return (
+        f"{label:<10} n={st['n']:<4} min={st['min_ms']:8.1f} median={st['median_ms']:8.1f} "
+        f"mean={st['mean_ms']:8.1f} p95={st['p95_ms']:8.1f} p99={st['p99_ms']:8.1f} ms"
+    )
+
+
+def print_report(result: dict) -> None:
+    frames = result["frames"]
+    print(_fmt_stats("all", frames["all"]))
+    for name, st in frames["per_path"].items():
+        print(_fmt_stats(name, st))
+    stages = result["stages_ms"]
+    total = sum(stages.values()) or 1.0
+    print(
+        "stages:  "
+        + "  ".join(f"{k}={v:.1f}ms ({100.0 * v / total:.0f}%)" for k, v in stages.items())
+    )
+    pipeline = result.get("pipeline_per_frame")
+    if pipeline:
+        print("per frame: " + "  ".join(f"{k}={v:,.0f}" for k, v in pipeline.items()))
+
+
+def compare(result: dict, baseline: dict, *, metrics=("median_ms", "p95_ms")) -> float:
+    """Print per-path deltas against `baseline`; returns the worst median change in %."""
+    worst = float("-inf")
+    rows = []
+    # "all" only means the same thing if both runs covered the same paths.
+    if result["config"]["paths"] == baseline["config"]["paths"]:
+        rows.append(("all", result["frames"]["all"], baseline["frames"]["all"]))
+    base_paths = baseline["frames"]["per_path"]
+    for name, st in result["frames"]["per_path"].items():
+        if name in base_paths:
+            rows.append((name, st, base_paths[name]))
+    for name, st, base in rows:
+        parts = []
+        for m in metrics:
+            b = base[m]
+            pct = 100.0 * (st[m] - b) / b if b else 0.0
+            parts.append(f"{m[:-3]} {b:8.1f} -> {st[m]:8.1f} ({pct:+6.1f}%)")
+            if m == "median_ms":
+                worst = max(worst, pct)
+        print(f"{name:<10} " + "  ".join(parts))
+    return worst
+
+
+def bench_main(args) -> int:
+    import afr.state as state
+    from afr.camera_path import camera_path
+    from afr.headless import init_headless
+    from afr.state import AppState, load
+
+    init_headless()
+    state.DEFERRED_PLOTTING = False
+    state.PLOT = state.plot_immediate
+
+    app_state = AppState(mouse_look=False)
+    load(app_state, use_cache=not args.no_cache, bundle=args.bundle, jobs=args.load_jobs)
+    spawn = app_state.mario_pos
+    paths = {spec: camera_path(spec, spawn, args.frames) for spec in args.paths}
+
+    result = run_bench(
+        app_state,
+        paths,
+        tuple(args.size),
+        warmup=args.warmup,
+        iterations=args.iterations,
+        fps=args.fps,
+    )
+    print_report(result)
+
+    if args.json is not None:
+        Path(args.json).write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"wrote {args.json}")
+
+    status = 0
+    if args.baseline is not None:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        if baseline.get("config", {}).get("size") != result["config"]["size"]:
+            print("warning: baseline was recorded at a different frame size")
+        print(f"vs {args.baseline}:")
+        worst = compare(result, baseline)
+        if args.fail_over is not None and worst > args.fail_over:
+            print(f"FAIL: median regressed {worst:.1f}% (limit {args.fail_over:.1f}%)")
+            status = 1
+
+    pygame.quit()
+    return status
@@ -0,0 +1,67 @@
+"""Offline-compiled, render-ready level bundles (`.afrbundle`)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from afr.level import CASTLE_PATH, MARIO_PATH, LevelAssets, build_level, level_from_sections, level_sections
+from afr.models.optimize import DEFAULT_CACHE_SIZE, optimize_mesh
+from afr.models.packfile import SectionFile, write_sections
+
+BUNDLE_MAGIC = b"AFRBUNDL"
+BUNDLE_VERSION = 1
+
+
+def compile_bundle(
+    out_path: str | Path,
+    castle_path: str | Path = CASTLE_PATH,
+    mario_path: str | Path = MARIO_PATH,
+    *,
+    mips: bool = True,
+    weld_eps: float = 0.0,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    verbose: bool = False,
+) -> LevelAssets:
+    level = build_level(Path(castle_path), Path(mario_path))
+
+    for name, scene in (("castle", level.castle), ("mario", level.mario)):
+        verts_before = verts_after = tris = 0
+        misses_before = misses_after = 0.0
+        for prim in scene.primitives:
+            prim.mesh, st = optimize_mesh(prim.mesh, weld_eps=weld_eps, cache_size=cache_size)
+            verts_before += st.verts_before
+            verts_after += st.verts_after
+            tris += st.tris
+            misses_before += st.acmr_before * st.tris
+            misses_after += st.acmr_after * st.tris
+        if verbose and tris:
+            print(
+                f"{name}: {len(scene.primitives)} prims, {tris} tris, "
+                f"verts {verts_before} -> {verts_after}, "
+                f"ACMR@{cache_size} {misses_before / tris:.3f} -> {misses_after / tris:.3f}"
+            )
+
+    write_sections(out_path, BUNDLE_MAGIC, BUNDLE_VERSION, level_sections(level, mips=mips))
+    if verbose:
+        print(f"wrote {out_path} ({Path(out_path).stat().st_size} bytes)")
+    return level
+
+
+def load_bundle(path: str | Path) -> LevelAssets:
+    with SectionFile(path, BUNDLE_MAGIC) as sf:
+        if sf.version != BUNDLE_VERSION:
+            raise ValueError(f"{path}: unsupported bundle version {sf.version}")
+        return level_from_sections(sf)
+
+
+def compile_assets_main(args) -> int:
+    compile_bundle(
+        args.output,
+        args.castle,
+        args.mario,
+        mips=not args.no_mips,
+        weld_eps=args.weld_eps,
+        cache_size=args.cache_size,
+        verbose=True,
+    )
+    return 0
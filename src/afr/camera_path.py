@@ -0,0 +1,104 @@
+"""Scripted camera paths for headless rendering and benchmarks."""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+from afr.linalg.vec3 import Vec3
+
+
+@dataclass
+class CameraPose:
+    pos: Vec3
+    yaw: float
+    pitch: float = -0.25
+
+
+def _lerp_pose(a: CameraPose, b: CameraPose, u: float) -> CameraPose:
+    return CameraPose(
+        pos=a.pos + (b.pos - a.pos) * u,
+        yaw=a.yaw + (b.yaw - a.yaw) * u,
+        pitch=a.pitch + (b.pitch - a.pitch) * u,
+    )
+
+
+def sample_keyframes(keys: list[tuple[float, CameraPose]], frames: int) -> list[CameraPose]:
+    """`frames` poses evenly spaced over keyframes given as (t in 0..1, pose)."""
+    if not keys:
+        raise ValueError("camera path has no keyframes")
+    keys = sorted(keys, key=lambda k: k[0])
+    out = []
+    for f in range(frames):
+        t = f / (frames - 1) if frames > 1 else 0.0
+        if t <= keys[0][0]:
+            out.append(keys[0][1])
+            continue
+        for (t0, p0), (t1, p1) in zip(keys, keys[1:]):
+            if t <= t1:
+                u = (t - t0) / (t1 - t0) if t1 > t0 else 1.0
+                out.append(_lerp_pose(p0, p1, u))
+                break
+        else:
+            out.append(keys[-1][1])
+    return out
+
+
+BUILTIN_PATHS = ("still", "orbit", "walk", "flyover")
+
+
+def builtin_path(name: str, spawn: Vec3, frames: int) -> list[CameraPose]:
+    if name == "still":
+        keys = [(0.0, CameraPose(spawn, math.pi))]
+    elif name == "orbit":
+        # Camera circles Mario once (it always sits behind him).
+        keys = [
+            (0.0, CameraPose(spawn, math.pi)),
+            (1.0, CameraPose(spawn, math.pi + 2.0 * math.pi)),
+        ]
+    elif name == "walk":
+        # Straight ahead (toward -Z) along the spawn height.
+        keys = [
+            (0.0, CameraPose(spawn, math.pi)),
+            (1.0, CameraPose(spawn + Vec3(0.0, 0.0, -30.0), math.pi)),
+        ]
+    elif name == "flyover":
+        # High pass across the whole castle, looking down.
+        lift = Vec3(0.0, 25.0, 0.0)
+        keys = [
+            (0.0, CameraPose(spawn + lift + Vec3(0.0, 0.0, 60.0), math.pi, -0.7)),
+            (1.0, CameraPose(spawn + lift + Vec3(0.0, 0.0, -60.0), math.pi, -0.7)),
+        ]
+    else:
+        raise ValueError(f"unknown camera path {name!r} (expected one of {', '.join(BUILTIN_PATHS)})")
+    return sample_keyframes(keys, frames)
+
+
+def load_path(path: str | Path, frames: int) -> list[CameraPose]:
+    """Keyframes from JSON: {"keyframes": [{"pos": [x, y, z], "yaw": .., "pitch": .., "t": ..}]}.
+
+    "t" (0..1) is optional; keyframes without it are spaced evenly.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    raw = data["keyframes"]
+    keys = []
+    for i, k in enumerate(raw):
+        t = k.get("t", i / (len(raw) - 1) if len(raw) > 1 else 0.0)
+        x, y, z = k["pos"]
+        keys.append((float(t), CameraPose(Vec3(x, y, z), float(k["yaw"]), float(k.get("pitch", -0.25)))))
+    return sample_keyframes(keys, frames)
+
+
+def camera_path(spec: str, spawn: Vec3, frames: int) -> list[CameraPose]:
+    """Resolve a built-in path name or a keyframe JSON file to `frames` poses."""
+    if spec in BUILTIN_PATHS:
+        return builtin_path(spec, spawn, frames)
+    return load_path(spec, frames)
+
+
+def apply_pose(app_state, pose: CameraPose) -> None:
+    app_state.mario_pos = pose.pos
+    app_state.mario_yaw = pose.yaw
+    app_state.cam_pitch = pose.pitch
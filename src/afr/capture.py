@@ -0,0 +1,169 @@
+"""Deferred-mode frame captures (`.afrcap`): a frame's pixel stream on disk."""
+
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+
+from afr.models.packfile import SectionFile, json_section, write_sections
+from afr.pixel_queue import PixelQueue
+
+CAPTURE_MAGIC = b"AFRCAPTR"
+CAPTURE_VERSION = 1
+
+
+def _put_varint(out: bytearray, v: int) -> None:
+    while v >= 0x80:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+
+
+def _get_varint(buf, pos: int) -> tuple[int, int]:
+    v = 0
+    shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        v |= (b & 0x7F) << shift
+        if b < 0x80:
+            return v, pos
+        shift += 7
+
+
+def write_capture(
+    path: str | Path,
+    queue: PixelQueue,
+    width: int,
+    height: int,
+    *,
+    clear_color=(0, 0, 0, 255),
+) -> int:
+    """Write every on-surface record in `queue` (left queued). Returns the count.
+
+    Records outside `width` x `height` are skipped, as the live drain drops
+    them; stored as a linear index they would wrap onto the next row.
+    """
+    coords = bytearray()
+    colors = bytearray()
+    palette: dict[int, int] = {}
+    prev = 0
+    run_color = -1
+    run_len = 0
+    count = 0
+
+    for xys, rgbas in queue.peek():
+        for xy, c in zip(xys, rgbas):
+            x = xy & 0xFFFF
+            y = xy >> 16
+            if x >= width or y >= height:
+                continue
+            count += 1
+            i = y * width + x
+            d = i - prev
+            prev = i
+            _put_varint(coords, (d << 1) if d >= 0 else ((-d << 1) - 1))
+
+            if c == run_color:
+                run_len += 1
+                continue
+            if run_len:
+                _put_varint(colors, run_len)
+                _put_varint(colors, palette[run_color])
+            if c not in palette:
+                palette[c] = len(palette)
+            run_color = c
+            run_len = 1
+    if run_len:
+        _put_varint(colors, run_len)
+        _put_varint(colors, palette[run_color])
+
+    # cap.coords: zigzag-varint deltas of y * width + x (spans cost 1 byte/pixel);
+    # cap.colors: (run length, palette index) varint pairs.
+    write_sections(
+        path,
+        CAPTURE_MAGIC,
+        CAPTURE_VERSION,
+        {
+            "cap.meta": json_section(
+                {"width": width, "height": height, "count": count, "clear": list(clear_color)}
+            ),
+            "cap.coords": bytes(coords),
+            "cap.palette": array("I", palette),
+            "cap.colors": bytes(colors),
+        },
+    )
+    return count
+
+
+class CapturePlayer:
+    """Stream a capture file back into a PixelQueue, `feed()` at a time."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._sf = SectionFile(path, CAPTURE_MAGIC)
+        if self._sf.version != CAPTURE_VERSION:
+            raise ValueError(f"{path}: unsupported capture version {self._sf.version}")
+        meta = self._sf.json("cap.meta")
+        self.width = meta["width"]
+        self.height = meta["height"]
+        self.count = meta["count"]
+        self.clear_color = tuple(meta["clear"])
+        self._coords = self._sf.view("cap.coords")
+        self._palette = self._sf.view("cap.palette")
+        self._colors = self._sf.view("cap.colors")
+        self.rewind()
+
+    def rewind(self) -> None:
+        self.played = 0
+        self._coord_pos = 0
+        self._color_pos = 0
+        self._prev = 0
+        self._run_left = 0
+        self._run_color = 0
+
+    @property
+    def done(self) -> bool:
+        return self.played >= self.count
+
+    def feed(self, queue: PixelQueue, n: int) -> int:
+        """Decode up to `n` more records onto the end of `queue`."""
+        n = min(n, self.count - self.played)
+        if n <= 0:
+            return 0
+        coords = self._coords
+        colors = self._colors
+        palette = self._palette
+        w = self.width
+        cpos = self._coord_pos
+        kpos = self._color_pos
+        prev = self._prev
+        run_left = self._run_left
+        run_color = self._run_color
+
+        xy = array("I", bytes(4 * n))
+        rgba = array("I", bytes(4 * n))
+        for k in range(n):
+            z, cpos = _get_varint(coords, cpos)
+            prev += (z >> 1) if not z & 1 else -((z + 1) >> 1)
+            y, x = divmod(prev, w)
+            xy[k] = y << 16 | x
+            if not run_left:
+                run_left, kpos = _get_varint(colors, kpos)
+                idx, kpos = _get_varint(colors, kpos)
+                run_color = palette[idx]
+            rgba[k] = run_color
+            run_left -= 1
+
+        self._coord_pos = cpos
+        self._color_pos = kpos
+        self._prev = prev
+        self._run_left = run_left
+        self._run_color = run_color
+        self.played += n
+        queue.extend(xy, rgba)
+        return n
+
+    def close(self) -> None:
+        self._coords = self._palette = self._colors = None
+        self._sf.close()
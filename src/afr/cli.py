@@ -1,7 +1,12 @@
 import argparse
 import sys
+from pathlib import Path
 
 import afr.state as state
+from afr.camera_path import BUILTIN_PATHS
+from afr.golden import GOLDEN_DIR, GOLDEN_SCENES
+from afr.level import CASTLE_PATH, MARIO_PATH
+from afr.settings import RES
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -23,10 +28,50 @@ def build_parser() -> argparse.ArgumentParser:
         default=60,
         help="Frame cap (use 0 for uncapped).",
     )
+    parser.add_argument(
+        "--physics-hz",
+        type=float,
+        default=120.0,
+        help="Fixed physics tick rate; Mario is drawn interpolated between ticks (0 = one step per frame).",
+    )
+    parser.add_argument(
+        "--target-fps",
+        type=float,
+        default=0.0,
+        help="Scale the internal render resolution each frame to hold this frame rate (0 = fixed resolution).",
+    )
+    parser.add_argument(
+        "--min-res-scale",
+        type=float,
+        default=0.35,
+        help="With --target-fps, the smallest render size as a fraction of the base resolution.",
+    )
+    parser.add_argument(
+        "--render-thread",
+        action="store_true",
+        help="Draw frames on a worker thread from per-frame snapshots (input/physics/present stay on the main thread).",
+    )
     parser.add_argument(
         "--stats",
         action="store_true",
-        help="Print FPS and effective blit throughput once per second.",
+        help="Profile each frame stage and show an on-screen overlay (summary printed on exit).",
+    )
+    parser.add_argument(
+        "--overdraw",
+        action="store_true",
+        help="Show an overdraw heat map (writes per pixel) instead of the shaded frame (not with --defer).",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        metavar="PATH",
+        help="Write per-frame/per-primitive timings as Chrome trace JSON (chrome://tracing, Perfetto).",
+    )
+    parser.add_argument(
+        "--trace-flush-frames",
+        type=int,
+        default=60,
+        help="Hand buffered trace events to the writer thread every N frames.",
     )
     parser.add_argument(
         "--bench-blit",
@@ -39,6 +84,356 @@ def build_parser() -> argparse.ArgumentParser:
         default=200_000,
         help="How many pixels to enqueue for --bench-blit.",
     )
+    parser.add_argument(
+        "--capture",
+        type=Path,
+        default=None,
+        help="Write the first deferred frame's pixel stream to this .afrcap file (implies --defer).",
+    )
+    parser.add_argument(
+        "--play-capture",
+        type=Path,
+        default=None,
+        help="Replay an .afrcap pixel stream at --blit-rate instead of rendering (implies --defer).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk .afrcache and always re-parse source assets.",
+    )
+    parser.add_argument(
+        "--load-jobs",
+        type=int,
+        default=0,
+        help="Parse models in worker processes and decode textures on this many threads (0 = serial).",
+    )
+    parser.add_argument(
+        "--bundle",
+        type=Path,
+        default=None,
+        help="Load the level from a precompiled .afrbundle (see compile-assets).",
+    )
+    parser.add_argument(
+        "--texture-budget-mb",
+        type=float,
+        default=None,
+        help="Memory budget for the shared decoded-texture cache (0 = unbounded; default AFR_TEXTURE_BUDGET_MB or 256).",
+    )
+    parser.add_argument(
+        "--texture-residency-mb",
+        type=float,
+        default=None,
+        help="Keep only recently drawn textures decoded, within this budget (default: keep all).",
+    )
+    parser.add_argument(
+        "--texture-evict-frames",
+        type=int,
+        default=300,
+        help="With --texture-residency-mb, evict textures not drawn for this many frames.",
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Log per-frame dt, keys and mouse movement to PATH for --replay.",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Drive the game from a --record log (recorded dt, not wall-clock) and exit at its end.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Load the level in the background, drawing untextured geometry until textures arrive.",
+    )
+
+    sub = parser.add_subparsers(dest="command")
+    compile_p = sub.add_parser(
+        "compile-assets",
+        help="Compile level source assets into a render-ready .afrbundle.",
+    )
+    compile_p.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="Output bundle path.",
+    )
+    compile_p.add_argument(
+        "--castle",
+        type=Path,
+        default=CASTLE_PATH,
+        help="Level model (.obj, .gltf or .afrmodel).",
+    )
+    compile_p.add_argument(
+        "--mario",
+        type=Path,
+        default=MARIO_PATH,
+        help="Player model (.obj, .gltf or .afrmodel).",
+    )
+    compile_p.add_argument(
+        "--no-mips",
+        action="store_true",
+        help="Skip building texture mip chains.",
+    )
+    compile_p.add_argument(
+        "--weld-eps",
+        type=float,
+        default=0.0,
+        help="Weld vertices whose position and UV differ by at most this (0 = exact).",
+    )
+    compile_p.add_argument(
+        "--cache-size",
+        type=int,
+        default=16,
+        help="Post-transform vertex cache size to optimize triangle order for.",
+    )
+
+    render_p = sub.add_parser(
+        "render",
+        help="Render a scripted camera path to image files without opening a window.",
+    )
+    render_p.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="Output directory for frame_NNNNN.png / .rgba files.",
+    )
+    render_p.add_argument(
+        "--path",
+        default="orbit",
+        help=f"Camera path: one of {', '.join(BUILTIN_PATHS)}, or a keyframe .json file.",
+    )
+    render_p.add_argument(
+        "--frames",
+        type=int,
+        default=60,
+        help="Number of frames to render along the path.",
+    )
+    render_p.add_argument(
+        "--fps",
+        type=float,
+        default=30.0,
+        help="Animation clock rate (frame i is rendered at t = i / fps).",
+    )
+    render_p.add_argument(
+        "--size",
+        type=int,
+        nargs=2,
+        metavar=("W", "H"),
+        default=[int(RES.x), int(RES.y)],
+        help="Frame size in pixels.",
+    )
+    render_p.add_argument(
+        "--format",
+        choices=("png", "raw"),
+        default="png",
+        help="png, or raw 8-bit RGBA bytes per frame.",
+    )
+
+    bench_p = sub.add_parser(
+        "bench",
+        help="Benchmark the 3D pipeline over fixed camera paths (headless).",
+    )
+    bench_p.add_argument(
+        "--paths",
+        nargs="+",
+        default=list(BUILTIN_PATHS),
+        help="Camera paths to render (built-in names or keyframe .json files).",
+    )
+    bench_p.add_argument(
+        "--frames",
+        type=int,
+        default=5,
+        help="Poses sampled along each path.",
+    )
+    bench_p.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="Untimed passes over all poses before measuring.",
+    )
+    bench_p.add_argument(
+        "--iterations",
+        type=int,
+        default=3,
+        help="Timed passes over all poses.",
+    )
+    bench_p.add_argument(
+        "--fps",
+        type=float,
+        default=30.0,
+        help="Fixed animation clock rate (frame i is drawn at t = i / fps).",
+    )
+    bench_p.add_argument(
+        "--size",
+        type=int,
+        nargs=2,
+        metavar=("W", "H"),
+        default=[int(RES.x), int(RES.y)],
+        help="Frame size in pixels.",
+    )
+    bench_p.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Write results as JSON (usable later as --baseline).",
+    )
+    bench_p.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Compare against a previous --json result.",
+    )
+    bench_p.add_argument(
+        "--fail-over",
+        type=float,
+        default=None,
+        help="With --baseline, exit 1 if any median frame time regressed by more than this percent.",
+    )
+
+    golden_p = sub.add_parser(
+        "golden",
+        help="Render fixed scenes headlessly and compare them against reference images.",
+    )
+    golden_p.add_argument(
+        "--scenes",
+        nargs="+",
+        choices=GOLDEN_SCENES,
+        default=list(GOLDEN_SCENES),
+        help="Scenes to check.",
+    )
+    golden_p.add_argument(
+        "--update",
+        action="store_true",
+        help="Re-render the reference images instead of comparing.",
+    )
+    golden_p.add_argument(
+        "--golden-dir",
+        type=Path,
+        default=GOLDEN_DIR,
+        help="Directory holding the reference <scene>.png files.",
+    )
+    golden_p.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=Path("golden-out"),
+        help="Where failing renders and diff images are written.",
+    )
+    golden_p.add_argument(
+        "--size",
+        type=int,
+        nargs=2,
+        metavar=("W", "H"),
+        default=[int(RES.x), int(RES.y)],
+        help="Frame size in pixels (must match the references).",
+    )
+    golden_p.add_argument(
+        "--tolerance",
+        type=int,
+        default=2,
+        help="Per-channel difference (0-255) a pixel may have and still match.",
+    )
+    golden_p.add_argument(
+        "--max-bad",
+        type=float,
+        default=0.001,
+        help="Fraction of pixels allowed to exceed --tolerance.",
+    )
+    golden_p.add_argument(
+        "--min-psnr",
+        type=float,
+        default=40.0,
+        help="Minimum PSNR in dB.",
+    )
+    golden_p.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Write per-scene results and rasterizer throughput as JSON.",
+    )
+    golden_p.add_argument(
+        "--no-raster-bench",
+        action="store_true",
+        help="Skip timing the rasterizers on fixed triangles.",
+    )
+
+    micro_p = sub.add_parser(
+        "microbench",
+        help="Time individual rasterizers and linalg operations (headless).",
+    )
+    micro_p.add_argument(
+        "filter",
+        nargs="*",
+        help="Glob patterns of case names to run, e.g. 'triangle_*/full' 'mat4*' (default: all).",
+    )
+    micro_p.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="Timed repeats per case (the median is reported).",
+    )
+    micro_p.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="Minimum seconds per repeat; fast cases are looped until they take this long.",
+    )
+    micro_p.add_argument(
+        "--size",
+        type=int,
+        nargs=2,
+        metavar=("W", "H"),
+        default=[int(RES.x), int(RES.y)],
+        help="Surface size the raster cases draw into.",
+    )
+    micro_p.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Write results as JSON (usable later as --baseline).",
+    )
+    micro_p.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Compare against a previous --json result.",
+    )
+    micro_p.add_argument(
+        "--fail-over",
+        type=float,
+        default=None,
+        help="With --baseline, exit 1 if any case slowed down by more than this percent.",
+    )
+
+    convert_p = sub.add_parser(
+        "convert-model",
+        help="Convert an .afrmodel between the text and binary formats.",
+    )
+    convert_p.add_argument("src", type=Path, help="Input .afrmodel (text or binary).")
+    convert_p.add_argument("dst", type=Path, help="Output .afrmodel.")
+    fmt = convert_p.add_mutually_exclusive_group()
+    fmt.add_argument(
+        "--binary",
+        dest="binary",
+        action="store_const",
+        const=True,
+        default=None,
+        help="Write the binary format (default: the opposite of the input).",
+    )
+    fmt.add_argument(
+        "--text",
+        dest="binary",
+        action="store_const",
+        const=False,
+        help="Write the text format.",
+    )
     return parser
 
 
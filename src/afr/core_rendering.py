@@ -1,3 +1,8 @@
+import sys
+from array import array
+from itertools import compress, repeat
+from operator import add, and_, lt, mul, ne, sub
+
 import pygame
 import glm
 
@@ -5,11 +10,12 @@ from afr.settings import RES, WINDOW_RES
 from afr.primitives import *
 from afr.colors import *
 import afr.state as state
+from afr.pixel_queue import unpack_rgba
 
 
-def draw_some_points(surface, dt: float, stats: bool = False) -> int:
+def draw_some_points(surface, dt: float) -> int:
     # Drain queued pixels at a fixed rate (pixels per second). This is only
-    # meaningful when deferred plotting is enabled.
+    # meaningful when deferred plotting is enabled. Returns how many were drawn.
     if not state.POINTS:
         return 0
 
@@ -24,22 +30,85 @@ def draw_some_points(surface, dt: float, stats: bool = False) -> int:
         return 0
     state.BLIT_ACCUM -= n
 
+    drained = 0
+    for xys, rgbas in state.POINTS.drain(n):
+        if surface.get_bytesize() == 4:
+            scatter_pixels(surface, xys, rgbas)
+        else:
+            _set_pixels(surface, xys, rgbas)
+        drained += len(xys)
+
+    return drained
+
+
+def _set_pixels(surface, xys, rgbas) -> None:
+    # Fallback for non-32-bit surfaces: one set_at per pixel.
     w = surface.get_width()
     h = surface.get_height()
-    drained = 0
     surface.lock()
     try:
-        for _ in range(min(n, len(state.POINTS))):
-            if not state.POINTS:
-                break
-            p, c = state.POINTS.popleft()
-            x = int(p.x)
-            y = int(p.y)
-            if 0 <= x < w and 0 <= y < h:
-                surface.set_at((x, y), c)
-            if stats:
-                drained += 1
+        for xy, c in zip(xys, rgbas):
+            x = xy & 0xFFFF
+            y = xy >> 16
+            if x < w and y < h:
+                surface.set_at((x, y), unpack_rgba(c))
     finally:
         surface.unlock()
 
-    return drained
+
+def _native_colors(surface, rgbas):
+    """Reorder packed RGBA records into the surface's 32-bit pixel layout."""
+    src = rgbas.cast("B")
+    little = sys.byteorder == "little"
+    shifts = surface.get_shifts()
+    masks = surface.get_masks()
+    if little and shifts == (0, 8, 16, 24) and masks[3]:
+        return rgbas
+    out = bytearray(len(src))
+    for k, shift in enumerate(shifts):
+        if not masks[k]:
+            continue  # no alpha channel
+        si = k if little else 3 - k
+        di = shift // 8 if little else 3 - shift // 8
+        out[di::4] = src[si::4]
+    return memoryview(out).cast("I")
+
+
+def scatter_pixels(surface, xys, rgbas) -> None:
+    """Write queued pixels into a 32-bit surface in bulk.
+
+    Same result as set_at per record in queue order (later writes win), but
+    the per-pixel work all runs inside C iterators: x/y are strided views
+    of the packed records, pixel indices come from map(), and rasterizer
+    output (row-major spans) is copied one contiguous run at a time.
+    """
+    w = surface.get_width()
+    h = surface.get_height()
+    stride = surface.get_pitch() // 4
+    xy16 = xys.cast("B").cast("H")
+    xs = xy16[0::2] if sys.byteorder == "little" else xy16[1::2]
+    ys = xy16[1::2] if sys.byteorder == "little" else xy16[0::2]
+    cols = _native_colors(surface, rgbas)
+
+    idx = list(map(add, map(mul, ys, repeat(stride)), xs))
+    if max(xs) >= w or max(ys) >= h:
+        keep = list(map(and_, map(lt, xs, repeat(w)), map(lt, ys, repeat(h))))
+        idx = list(compress(idx, keep))
+        cols = memoryview(array("I", compress(cols, keep)))
+    if not idx:
+        return
+
+    # Start of each run of consecutive pixel indices.
+    starts = [0]
+    starts += compress(range(1, len(idx)), map(ne, map(sub, idx[1:], idx[:-1]), repeat(1)))
+    starts.append(len(idx))
+
+    pixels = surface.get_buffer()
+    try:
+        pix = memoryview(pixels).cast("B").cast("I")
+        for a, b in zip(starts, starts[1:]):
+            i = idx[a]
+            pix[i : i + b - a] = cols[a:b]
+        pix.release()
+    finally:
+        del pixels
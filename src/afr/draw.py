@@ -1,4 +1,5 @@
 import pygame
+from afr import pipeline_stats, profiler
 from afr.linalg.mat4 import Mat4
 from afr.linalg.vec2 import Vec2
 from afr.linalg.vec3 import Vec3
@@ -50,16 +51,83 @@ def draw_mouse_coords(surface):
     surface.blit(text, (10, 10))
 
 
-def draw(surface, app_state):
+# Scratch buffers reused across frames, one per role ("world", "hud"), and
+# reallocated only when their size changes (e.g. under --target-fps).
+_zbufs: dict[str, tuple[list[float], list[float]]] = {}
+_surfaces: dict[str, object] = {}
+
+
+def _scratch_zbuf(role: str, n: int) -> list[float]:
+    """A cleared (all +inf) z-buffer of `n` entries."""
+    entry = _zbufs.get(role)
+    if entry is None or len(entry[1]) != n:
+        clear = [float("inf")] * n
+        entry = (list(clear), clear)
+        _zbufs[role] = entry
+    else:
+        entry[0][:] = entry[1]
+    return entry[0]
+
+
+def _scratch_surface(role: str, w: int, h: int):
+    surf = _surfaces.get(role)
+    if surf is None or surf.get_size() != (w, h):
+        surf = pygame.Surface((w, h), flags=pygame.SRCALPHA, depth=32)
+        _surfaces[role] = surf
+    return surf
+
+
+def draw_loading(surface, progress: float, status: str):
+    # Progress bar along the bottom edge while the level streams in.
+    w = surface.get_width()
+    h = surface.get_height()
+    bar_h = max(3, h // 40)
+    y = h - bar_h - 2
+    pygame.draw.rect(surface, (40, 40, 40, 255), (2, y, w - 4, bar_h))
+    fill_w = int((w - 4) * min(1.0, max(0.0, progress)))
+    if fill_w > 0:
+        pygame.draw.rect(surface, (230, 200, 60, 255), (2, y, fill_w, bar_h))
+    font = pygame.font.Font(None, max(12, h // 12))
+    text = font.render(f"loading {status} {progress * 100:3.0f}%", True, (255, 255, 255))
+    surface.blit(text, (4, y - text.get_height() - 1))
+
+
+def draw(surface, app_state, t: float | None = None, timings: dict | None = None):
+    """Render one frame of the game into `surface`.
+
+    If `timings` is given, seconds spent in each stage ("setup", "castle",
+    "mario", "hud") are added to it (and reported to the active profiler
+    as "draw.<stage>" either way).
+    """
     import math
+    import time
+
+    prof = profiler.PROFILER
+    stage_t0 = time.perf_counter()
+
+    def stage(name):
+        nonlocal stage_t0
+        if timings is None and prof is None:
+            return
+        now = time.perf_counter()
+        elapsed = now - stage_t0
+        stage_t0 = now
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + elapsed
+        if prof is not None:
+            prof.add("draw." + name, elapsed)
 
     world_up = Vec3(0.0, 1.0, 0.0)
-    t = pygame.time.get_ticks() / 1000.0
+    # Animation clock (HUD spin/wiggle); pass `t` for reproducible frames.
+    if t is None:
+        t = pygame.time.get_ticks() / 1000.0
 
     # Third-person camera: behind Mario, looking where he's facing.
     yaw = float(getattr(app_state, "mario_yaw", 0.0))
     pitch = float(getattr(app_state, "cam_pitch", 0.0))
-    mario_pos = getattr(app_state, "mario_pos", Vec3(0.0, 1.0, 10.0))
+    mario_pos = getattr(app_state, "mario_render_pos", None) or getattr(
+        app_state, "mario_pos", Vec3(0.0, 1.0, 10.0)
+    )
 
     cy = math.cos(yaw)
     sy = math.sin(yaw)
@@ -94,7 +162,11 @@ def draw(surface, app_state):
     scene = Scene(lights=lights, ambient=0.22)
 
     # Z-buffer per frame (CPU), shared across all cubes.
-    zbuf = [float("inf")] * (surface.get_width() * surface.get_height())
+    zbuf = _scratch_zbuf("world", w * h)
+    if pipeline_stats.STATS is not None:
+        pipeline_stats.STATS.begin_frame(w, h)
+
+    stage("setup")
 
     if getattr(app_state, "castle_scene", None) is not None:
         for prim in app_state.castle_scene.primitives:
@@ -102,6 +174,8 @@ def draw(surface, app_state):
                 surface, prim, Mat4.identity(), view, proj, scene=scene, zbuf=zbuf
             )
 
+    stage("castle")
+
     if getattr(app_state, "mario_scene", None) is not None:
         mario_world = Mat4.translate(
             mario_pos.x, mario_pos.y, mario_pos.z
@@ -111,11 +185,13 @@ def draw(surface, app_state):
                 surface, prim, mario_world, view, proj, scene=scene, zbuf=zbuf
             )
 
+    stage("mario")
+
     # HUD/status Mario: draw a big Mario on the left side of the screen.
     if getattr(app_state, "mario_scene", None) is not None:
         hud_w = max(64, surface.get_width() // 3)
         hud_h = max(64, surface.get_height() // 2)
-        hud = pygame.Surface((hud_w, hud_h), flags=pygame.SRCALPHA, depth=32)
+        hud = _scratch_surface("hud", hud_w, hud_h)
         hud.fill((0, 0, 0, 0))
 
         # Slight backdrop so he reads on dark backgrounds.
@@ -130,7 +206,7 @@ def draw(surface, app_state):
             up=world_up,
         )
         hud_view = hud_cam.view()
-        hud_z = [float("inf")] * (hud_w * hud_h)
+        hud_z = _scratch_zbuf("hud", hud_w * hud_h)
 
         # Make him big, face the camera, and shift down so the face stays in-frame.
         hud_scale = 2.6
@@ -194,3 +270,4 @@ def draw(surface, app_state):
         pad_x = int(surface.get_width() * 0.02)
         pad_y = int(surface.get_height() * 0.18)
         surface.blit(hud, (pad_x, pad_y))
+    stage("hud")
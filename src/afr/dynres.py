@@ -0,0 +1,68 @@
+"""Dynamic render resolution (`--target-fps`)."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ResolutionController:
+    target_fps: float
+    base: tuple[int, int]
+    min_scale: float = 0.35
+    max_scale: float = 1.0
+    smoothing: float = 0.15
+    gain: float = 0.25
+    quantum: int = 8
+
+    scale: float = 1.0
+    ema_ms: float = 0.0
+    changes: int = 0
+    size: tuple[int, int] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.scale = max(self.min_scale, min(self.max_scale, self.scale))
+        self.size = self._quantize(self.scale)
+
+    @property
+    def target_ms(self) -> float:
+        return 1000.0 / self.target_fps
+
+    def _quantize(self, scale: float) -> tuple[int, int]:
+        bw, bh = self.base
+        q = self.quantum
+        w = max(q, int(round(bw * scale / q)) * q)
+        w = min(w, bw)
+        h = max(1, int(round(w * bh / bw)))
+        return w, h
+
+    def update(self, frame_ms: float) -> bool:
+        """Feed one frame's work time; returns True if `size` changed."""
+        if self.ema_ms <= 0.0:
+            self.ema_ms = frame_ms
+        else:
+            self.ema_ms += self.smoothing * (frame_ms - self.ema_ms)
+        if self.ema_ms <= 0.0:
+            return False
+
+        ideal = self.scale * math.sqrt(self.target_ms / self.ema_ms)
+        self.scale += self.gain * (ideal - self.scale)
+        self.scale = max(self.min_scale, min(self.max_scale, self.scale))
+
+        size = self._quantize(self.scale)
+        if size == self.size:
+            return False
+        # Expect the new size to cost in proportion to its pixel count, so
+        # the smoothed time doesn't keep pushing in the same direction.
+        self.ema_ms *= (size[0] * size[1]) / (self.size[0] * self.size[1])
+        self.size = size
+        self.changes += 1
+        return True
+
+    def stats(self) -> str:
+        w, h = self.size
+        return (
+            f"{w}x{h} ({100.0 * w / self.base[0]:.0f}%), {self.ema_ms:.1f} ms "
+            f"(target {self.target_ms:.1f}), {self.changes} resizes"
+        )
@@ -0,0 +1,200 @@
+"""Golden-image regression check (`afr golden`)."""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from pathlib import Path
+
+import pygame
+
+GOLDEN_DIR = Path(__file__).resolve().parents[2] / "assets" / "golden"
+GOLDEN_SCENES = ("cube", "quad", "triangle", "mario", "castle")
+SMALL_MODELS = ("cube", "quad", "triangle")
+CLEAR = (0, 0, 0, 255)
+
+
+def _frame_model(surface, scene_data, *, yaw: float = 0.6, pitch: float = 0.45) -> None:
+    """Draw `scene_data` lit, from a fixed angle, fitted to its bounding sphere."""
+    from afr.level import scene_bounds
+    from afr.linalg.mat4 import Mat4
+    from afr.linalg.vec3 import Vec3
+    from afr.rendering import Camera, PointLight, Scene, draw_model
+
+    mn, mx = scene_bounds(scene_data)
+    center = (mn + mx) * 0.5
+    radius = max(1e-3, (mx - mn).mag() * 0.5)
+    fov = math.radians(50.0)
+    dist = radius / math.sin(fov * 0.5) * 1.1
+    eye = center + Vec3(
+        math.cos(pitch) * math.sin(yaw), math.sin(pitch), math.cos(pitch) * math.cos(yaw)
+    ) * dist
+
+    w, h = surface.get_size()
+    view = Camera(pos=eye, target=center).view()
+    proj = Mat4.perspective(fov, w / h, dist * 0.01, dist * 4.0)
+    light = PointLight(pos=center + Vec3(2.0, 4.0, 3.0) * radius * 4.0, intensity=1.2)
+    scene = Scene(lights=[light], ambient=0.25)
+    zbuf = [float("inf")] * (w * h)
+    for prim in scene_data.primitives:
+        # Single-sided test models (quad, triangle) face away from some angles;
+        # the golden images are about the rasterizers, so draw both sides.
+        draw_model(
+            surface,
+            prim.mesh,
+            prim.material,
+            prim.local_to_world,
+            view,
+            proj,
+            scene=scene,
+            zbuf=zbuf,
+            cull_backfaces=False,
+        )
+
+
+def render_scene(name: str, size: tuple[int, int], app_state) -> pygame.Surface:
+    from afr.draw import draw
+    from afr.level import MODELS_DIR, load_scene
+
+    surface = pygame.Surface(size, flags=pygame.SRCALPHA, depth=32)
+    surface.fill(CLEAR)
+    if name in SMALL_MODELS:
+        _frame_model(surface, load_scene(MODELS_DIR / f"{name}.obj"))
+    elif name == "mario":
+        _frame_model(surface, app_state.mario_scene, yaw=0.4, pitch=0.15)
+    elif name == "castle":
+        draw(surface, app_state, t=0.0)
+    else:
+        raise ValueError(f"unknown golden scene {name!r} (expected one of {', '.join(GOLDEN_SCENES)})")
+    return surface
+
+
+def compare_surfaces(actual, expected, *, tolerance: int = 2) -> dict:
+    """Per-pixel RGB comparison: bad pixel count/fraction, max channel error, PSNR."""
+    if actual.get_size() != expected.get_size():
+        return {"size_mismatch": True, "bad": -1, "bad_frac": 1.0, "max_err": 255, "psnr": 0.0}
+    a = pygame.image.tobytes(actual, "RGB")
+    b = pygame.image.tobytes(expected, "RGB")
+    bad = 0
+    max_err = 0
+    sq = 0
+    for i in range(0, len(a), 3):
+        e = max(abs(a[i] - b[i]), abs(a[i + 1] - b[i + 1]), abs(a[i + 2] - b[i + 2]))
+        if e:
+            sq += (a[i] - b[i]) ** 2 + (a[i + 1] - b[i + 1]) ** 2 + (a[i + 2] - b[i + 2]) ** 2
+            if e > max_err:
+                max_err = e
+            if e > tolerance:
+                bad += 1
+    n = len(a) // 3
+    mse = sq / max(1, len(a))
+    psnr = math.inf if mse == 0 else 10.0 * math.log10(255.0 * 255.0 / mse)
+    return {"bad": bad, "bad_frac": bad / max(1, n), "max_err": max_err, "psnr": psnr}
+
+
+def diff_image(actual, expected, *, tolerance: int = 2) -> pygame.Surface:
+    """Dimmed grey copy of `actual` with pixels off by more than `tolerance` in red."""
+    w, h = actual.get_size()
+    a = pygame.image.tobytes(actual, "RGB")
+    b = pygame.image.tobytes(expected, "RGB")
+    out = bytearray(len(a))
+    for i in range(0, len(a), 3):
+        e = max(abs(a[i] - b[i]), abs(a[i + 1] - b[i + 1]), abs(a[i + 2] - b[i + 2]))
+        if e > tolerance:
+            out[i] = 255
+        else:
+            g = (a[i] + a[i + 1] + a[i + 2]) // 9
+            out[i] = out[i + 1] = out[i + 2] = g
+    return pygame.image.frombytes(bytes(out), (w, h), "RGB")
+
+
+def raster_throughput(*, size: tuple[int, int] = (240, 160)) -> dict[str, float]:
+    """Pixels/sec of the z-buffered rasterizers (afr.microbench cases)."""
+    from afr.microbench import run_microbench
+
+    result = run_microbench(["*_z/medium", "*_z/full"], repeats=3, min_time=0.02, size=size)
+    return {name: row["px_per_s"] for name, row in result["results"].items()}
+
+
+def golden_main(args) -> int:
+    import afr.state as state
+    from afr import pipeline_stats
+    from afr.headless import init_headless
+    from afr.state import AppState, load
+
+    init_headless()
+    state.DEFERRED_PLOTTING = False
+    state.PLOT = state.plot_immediate
+
+    size = tuple(args.size)
+    app_state = None
+    if any(name in ("mario", "castle") for name in args.scenes):
+        app_state = AppState(mouse_look=False)
+        load(app_state, use_cache=not args.no_cache, bundle=args.bundle, jobs=args.load_jobs)
+
+    ref_dir = Path(args.golden_dir)
+    out_dir = Path(args.output)
+    report = {"size": list(size), "scenes": {}, "raster_px_per_s": {}}
+    failed = []
+    for name in args.scenes:
+        pstats = pipeline_stats.PipelineStats()
+        pipeline_stats.STATS = pstats
+        t0 = time.perf_counter()
+        actual = render_scene(name, size, app_state)
+        render_s = time.perf_counter() - t0
+        pipeline_stats.STATS = None
+        row = {"render_s": render_s, "px_per_s": pstats.pixels_written / render_s if render_s else 0.0}
+
+        ref_path = ref_dir / f"{name}.png"
+        if args.update:
+            ref_dir.mkdir(parents=True, exist_ok=True)
+            pygame.image.save(actual, str(ref_path))
+            print(f"{name:<10} updated {ref_path}")
+            report["scenes"][name] = row
+            continue
+        if not ref_path.exists():
+            print(f"{name:<10} MISSING  {ref_path} (run with --update)")
+            failed.append(name)
+            report["scenes"][name] = {**row, "missing": True}
+            continue
+
+        expected = pygame.image.load(str(ref_path))
+        cmp = compare_surfaces(actual, expected, tolerance=args.tolerance)
+        ok = (
+            not cmp.get("size_mismatch")
+            and cmp["bad_frac"] <= args.max_bad
+            and cmp["psnr"] >= args.min_psnr
+        )
+        row.update(cmp, ok=ok)
+        report["scenes"][name] = row
+        psnr = "inf" if cmp["psnr"] == math.inf else f"{cmp['psnr']:.1f}"
+        print(
+            f"{name:<10} {'ok  ' if ok else 'FAIL'}  bad={cmp['bad']:<6} max_err={cmp['max_err']:<3} "
+            f"psnr={psnr:>5} dB  {row['px_per_s']:,.0f} px/s"
+        )
+        if not ok:
+            failed.append(name)
+            out_dir.mkdir(parents=True, exist_ok=True)
+            pygame.image.save(actual, str(out_dir / f"{name}.png"))
+            if not cmp.get("size_mismatch"):
+                diff = diff_image(actual, expected, tolerance=args.tolerance)
+                pygame.image.save(diff, str(out_dir / f"{name}.diff.png"))
+
+    if not args.no_raster_bench:
+        report["raster_px_per_s"] = raster_throughput(size=size)
+        print("raster:    " + "  ".join(f"{k} {v:,.0f} px/s" for k, v in report["raster_px_per_s"].items()))
+
+    if args.json is not None:
+        # JSON has no Infinity; identical images report psnr null.
+        for row in report["scenes"].values():
+            if row.get("psnr") == math.inf:
+                row["psnr"] = None
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"wrote {args.json}")
+
+    pygame.quit()
+    if failed:
+        print(f"FAIL: {', '.join(failed)} (renders and diffs in {out_dir})")
+        return 1
+    return 0
@@ -0,0 +1,136 @@
+"""Headless batch rendering (`afr render`): no window, no input, no event loop."""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+import pygame
+
+RAW_FORMAT = "RGBA"
+
+
+def init_headless() -> None:
+    """Bring pygame up without a real display.
+
+    A 1x1 dummy-driver display still exists so texture loading can
+    convert_alpha exactly as it does in the windowed game.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))
+
+
+class FrameWriter:
+    """Write frames from a background thread.
+
+    `submit()` snapshots the surface's pixels on the caller's thread (so
+    the caller can immediately draw the next frame into it) and queues the
+    encode + write. At most `max_pending` frames are buffered; beyond that
+    `submit()` blocks, which keeps memory bounded when encoding is slower
+    than rendering.
+    """
+
+    def __init__(self, out_dir: str | Path, fmt: str = "png", *, max_pending: int = 8):
+        if fmt not in ("png", "raw"):
+            raise ValueError(f"unsupported frame format {fmt!r}")
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+        self.written = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="afr-frame-writer", daemon=True)
+        self._thread.start()
+
+    def path_for(self, index: int) -> Path:
+        ext = "png" if self.fmt == "png" else RAW_FORMAT.lower()
+        return self.out_dir / f"frame_{index:05d}.{ext}"
+
+    def submit(self, index: int, surface) -> None:
+        if self._error is not None:
+            raise self._error
+        raw = pygame.image.tobytes(surface, RAW_FORMAT)
+        self._queue.put((index, surface.get_size(), raw))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue
+            index, size, raw = item
+            try:
+                path = self.path_for(index)
+                if self.fmt == "png":
+                    pygame.image.save(pygame.image.frombytes(raw, size, RAW_FORMAT), str(path))
+                else:
+                    path.write_bytes(raw)
+                self.written += 1
+            except BaseException as e:
+                self._error = e
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
+def render_frames(
+    app_state,
+    poses,
+    writer: FrameWriter,
+    size: tuple[int, int],
+    *,
+    fps: float = 30.0,
+) -> float:
+    """Render one frame per pose; returns total render time (excluding I/O waits)."""
+    from afr.camera_path import apply_pose
+    from afr.draw import draw
+
+    surface = pygame.Surface(size, flags=pygame.SRCALPHA, depth=32)
+    render_s = 0.0
+    for i, pose in enumerate(poses):
+        apply_pose(app_state, pose)
+        t0 = time.perf_counter()
+        surface.fill((0, 0, 0, 255))
+        draw(surface, app_state, t=i / fps)
+        render_s += time.perf_counter() - t0
+        writer.submit(i, surface)
+    return render_s
+
+
+def render_main(args) -> int:
+    import afr.state as state
+    from afr.camera_path import camera_path
+    from afr.state import AppState, load
+
+    init_headless()
+    state.DEFERRED_PLOTTING = False
+    state.PLOT = state.plot_immediate
+
+    app_state = AppState(mouse_look=False)
+    load(app_state, use_cache=not args.no_cache, bundle=args.bundle, jobs=args.load_jobs)
+    poses = camera_path(args.path, app_state.mario_pos, args.frames)
+
+    t0 = time.perf_counter()
+    writer = FrameWriter(args.output, args.format)
+    try:
+        render_s = render_frames(app_state, poses, writer, tuple(args.size), fps=args.fps)
+    finally:
+        writer.close()
+    total_s = time.perf_counter() - t0
+
+    w, h = args.size
+    print(
+        f"wrote {writer.written} {args.format} frames ({w}x{h}) to {args.output} "
+        f"in {total_s:.2f}s (render {render_s:.2f}s)"
+    )
+    pygame.quit()
+    return 0
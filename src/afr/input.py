@@ -1,4 +1,5 @@
 import math
+from dataclasses import dataclass
 
 import pygame
 
@@ -11,48 +12,95 @@ def init_input(app_state) -> None:
         pygame.mouse.set_visible(False)
 
 
-def do_inputs(app_state, dt: float) -> bool:
-    """Process inputs/events and update mario + camera angles in app_state.
+# Keys that drive the game, as bits of InputFrame.keys.
+KEY_BITS = {
+    pygame.K_w: 1 << 0,
+    pygame.K_s: 1 << 1,
+    pygame.K_a: 1 << 2,
+    pygame.K_d: 1 << 3,
+    pygame.K_LSHIFT: 1 << 4,
+    pygame.K_RSHIFT: 1 << 5,
+}
+KEY_W, KEY_S, KEY_A, KEY_D, KEY_LSHIFT, KEY_RSHIFT = KEY_BITS.values()
 
-    Returns True to keep running, False to quit.
-    """
-    mouse_dx = 0
-    mouse_dy = 0
 
-    app_state.jump_pressed = False
+@dataclass
+class InputFrame:
+    """Everything one frame of input contributes (what --record stores)."""
 
+    dt: float
+    keys: int = 0  # KEY_BITS held this frame
+    mouse_dx: int = 0
+    mouse_dy: int = 0
+    jump: bool = False
+    toggle_mouse_look: bool = False
+    quit: bool = False
+
+
+def poll_input(dt: float) -> InputFrame:
+    """Drain pygame's event queue and sample the keyboard into an InputFrame."""
+    frame = InputFrame(dt)
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
-            return False
+            frame.quit = True
 
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
-                return False
-
+                frame.quit = True
             if event.key == pygame.K_m:
-                app_state.mouse_look = not app_state.mouse_look
-                pygame.event.set_grab(app_state.mouse_look)
-                pygame.mouse.set_visible(not app_state.mouse_look)
-
+                frame.toggle_mouse_look = not frame.toggle_mouse_look
             if event.key == pygame.K_SPACE:
-                app_state.jump_pressed = True
+                frame.jump = True
 
-        if event.type == pygame.MOUSEMOTION and app_state.mouse_look:
+        if event.type == pygame.MOUSEMOTION:
             rel = event.rel
-            mouse_dx += rel[0]
-            mouse_dy += rel[1]
+            frame.mouse_dx += rel[0]
+            frame.mouse_dy += rel[1]
+
+    pressed = pygame.key.get_pressed()
+    for key, bit in KEY_BITS.items():
+        if pressed[key]:
+            frame.keys |= bit
+    return frame
+
+
+def quit_requested() -> bool:
+    """Only look for quit (window close / Esc); used while replaying input."""
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            return True
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            return True
+    return False
+
+
+def apply_input(app_state, frame: InputFrame) -> bool:
+    """Update mario + camera angles in app_state from one frame of input.
+
+    Returns True to keep running, False to quit.
+    """
+    # Latched until physics consumes it (there may be no physics tick this frame).
+    if frame.jump:
+        app_state.jump_pressed = True
+    if frame.quit:
+        return False
+
+    if frame.toggle_mouse_look:
+        app_state.mouse_look = not app_state.mouse_look
+        pygame.event.set_grab(app_state.mouse_look)
+        pygame.mouse.set_visible(not app_state.mouse_look)
 
     # Yaw/pitch from mouse (camera follows behind Mario).
     if app_state.mouse_look:
         sens = 0.0025
         # Positive mouse_dx should look right (increase yaw).
-        app_state.mario_yaw += mouse_dx * sens
+        app_state.mario_yaw += frame.mouse_dx * sens
         # Mouse up should look up; pygame gives negative dy for up.
-        app_state.cam_pitch += -mouse_dy * sens
+        app_state.cam_pitch += -frame.mouse_dy * sens
         # Clamp pitch to avoid flipping.
         app_state.cam_pitch = max(-1.25, min(1.25, app_state.cam_pitch))
 
-    keys = pygame.key.get_pressed()
+    keys = frame.keys
     # Q/E intentionally unbound.
 
     # Flat forward/right for Mario movement (XZ plane).
@@ -64,16 +112,28 @@ def do_inputs(app_state, dt: float) -> bool:
 
     # Movement intent: Mario locomotion (W/S forward/back, A/D strafe).
     move = Vec3(0.0, 0.0, 0.0)
-    if keys[pygame.K_w]:
+    if keys & KEY_W:
         move = move + forward
-    if keys[pygame.K_s]:
+    if keys & KEY_S:
         move = move - forward
-    if keys[pygame.K_d]:
+    if keys & KEY_D:
         move = move + right
-    if keys[pygame.K_a]:
+    if keys & KEY_A:
         move = move - right
 
     app_state.move_dir = move
-    app_state.sprint = bool(keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT])
+    app_state.sprint = bool(keys & (KEY_LSHIFT | KEY_RSHIFT))
 
     return True
+
+
+def do_inputs(app_state, dt: float, recorder=None) -> bool:
+    """Process inputs/events and update mario + camera angles in app_state.
+
+    With `recorder` (afr.input_log.InputRecorder) the frame is also logged.
+    Returns True to keep running, False to quit.
+    """
+    frame = poll_input(dt)
+    if recorder is not None:
+        recorder.write(frame)
+    return apply_input(app_state, frame)
@@ -0,0 +1,96 @@
+"""Input recording and deterministic replay (`--record` / `--replay`)."""
+
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+from afr.input import InputFrame
+
+INPUT_LOG_MAGIC = b"AFRINPUT"
+INPUT_LOG_VERSION = 1
+
+# magic, version, flags (bit 0: mouse look on)
+_HEADER = struct.Struct("<8sHB")
+# dt, key bits (afr.input.KEY_BITS), mouse dx, mouse dy, _JUMP/_TOGGLE_LOOK/_QUIT
+_FRAME = struct.Struct("<dBhhB")
+
+_JUMP = 1 << 0
+_TOGGLE_LOOK = 1 << 1
+_QUIT = 1 << 2
+
+
+def _clamp16(v: int) -> int:
+    return max(-32768, min(32767, int(v)))
+
+
+class InputRecorder:
+    def __init__(self, path: str | Path, *, mouse_look: bool):
+        self.path = Path(path)
+        self.frames = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("wb")
+        self._file.write(_HEADER.pack(INPUT_LOG_MAGIC, INPUT_LOG_VERSION, 1 if mouse_look else 0))
+
+    def write(self, frame: InputFrame) -> None:
+        flags = (
+            (_JUMP if frame.jump else 0)
+            | (_TOGGLE_LOOK if frame.toggle_mouse_look else 0)
+            | (_QUIT if frame.quit else 0)
+        )
+        self._file.write(
+            _FRAME.pack(
+                frame.dt, frame.keys, _clamp16(frame.mouse_dx), _clamp16(frame.mouse_dy), flags
+            )
+        )
+        self.frames += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class InputPlayer:
+    """Reads a whole input log up front; `next_frame()` is None at the end."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        data = self.path.read_bytes()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{self.path}: not an input log (too short)")
+        magic, version, flags = _HEADER.unpack_from(data, 0)
+        if magic != INPUT_LOG_MAGIC:
+            raise ValueError(f"{self.path}: not an input log (bad magic)")
+        if version != INPUT_LOG_VERSION:
+            raise ValueError(f"{self.path}: unsupported input log version {version}")
+        self.mouse_look = bool(flags & 1)
+        body = memoryview(data)[_HEADER.size :]
+        # A truncated trailing record (crash while recording) is dropped.
+        usable = len(body) - len(body) % _FRAME.size
+        self._records = list(_FRAME.iter_unpack(body[:usable]))
+        self.played = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def done(self) -> bool:
+        return self.played >= len(self._records)
+
+    @property
+    def duration(self) -> float:
+        return sum(r[0] for r in self._records)
+
+    def next_frame(self) -> InputFrame | None:
+        if self.done:
+            return None
+        dt, keys, dx, dy, flags = self._records[self.played]
+        self.played += 1
+        return InputFrame(
+            dt=dt,
+            keys=keys,
+            mouse_dx=dx,
+            mouse_dy=dy,
+            jump=bool(flags & _JUMP),
+            toggle_mouse_look=bool(flags & _TOGGLE_LOOK),
+            quit=bool(flags & _QUIT),
+        )
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from afr.linalg.mat4 import Mat4
+from afr.linalg.vec3 import Vec3
+from afr.models.afrmodel import load_afrmodel
+from afr.models.cache import AssetCache
+from afr.models.gltf import load_gltf_scene
+from afr.models.obj import load_obj
+from afr.models.packed import (
+    TextureTable,
+    pack_collider,
+    pack_scene,
+    unpack_collider,
+    unpack_scene,
+    unpack_textures,
+)
+from afr.models.packfile import json_section
+from afr.models.textures import TextureDecodes
+from afr.physics import CastleCollider, build_collider_from_scene, raycast_down_y
+from afr.scene import SceneData
+
+MODELS_DIR = Path(__file__).resolve().parents[2] / "assets" / "models"
+CASTLE_PATH = MODELS_DIR / "peaches_castle.obj"
+MARIO_PATH = (
+    MODELS_DIR
+    / "mario-64-mario"
+    / "source"
+    / "prototype_mario_super_mario_64"
+    / "scene.gltf"
+)
+
+# Bump when build_level() changes what it produces, so cached levels rebuild.
+LEVEL_OPTIONS = {"level": 1}
+
+
+@dataclass
+class LevelAssets:
+    """Everything `state.load` needs: final-transform scenes + collider + spawn."""
+
+    castle: SceneData
+    mario: SceneData
+    collider: CastleCollider
+    spawn: Vec3
+
+
+def scene_bounds(scene: SceneData) -> tuple[Vec3, Vec3]:
+    mn = Vec3(1e9, 1e9, 1e9)
+    mx = Vec3(-1e9, -1e9, -1e9)
+    for prim in scene.primitives:
+        for v in prim.mesh.positions:
+            wv = prim.local_to_world @ v
+            mn = Vec3(min(mn.x, wv.x), min(mn.y, wv.y), min(mn.z, wv.z))
+            mx = Vec3(max(mx.x, wv.x), max(mx.y, wv.y), max(mx.z, wv.z))
+    return mn, mx
+
+
+def load_scene(
+    path: str | Path,
+    *,
+    load_textures: bool = True,
+    progress: Callable[[int, int], None] | None = None,
+) -> SceneData:
+    """Load any supported model file (.obj, .gltf, .afrmodel) by extension.
+
+    `progress(done, total)` is reported for OBJ files (streamed in chunks).
+    """
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix == ".obj":
+        if progress is not None:
+            return load_obj(p, load_textures=load_textures, stream=True, progress=progress)
+        return load_obj(p, load_textures=load_textures)
+    if suffix == ".gltf":
+        return load_gltf_scene(p, load_textures=load_textures)
+    if suffix == ".afrmodel":
+        return load_afrmodel(p)
+    raise ValueError(f"{p}: unsupported model format {p.suffix!r}")
+
+
+# The two assets are normalized independently: Mario is scaled to exactly 1
+# world unit tall, and the castle is sized in those units ("100 Marios wide"),
+# so neither step needs the other's bounds. Only the collider/spawn depend on
+# the castle's *final* transform, so they are baked right after it.
+
+
+def bake_castle(castle: SceneData) -> tuple[SceneData, CastleCollider, Vec3]:
+    """Scale/recenter the castle in place, then build its collider + spawn."""
+    # Make the castle about 100 Marios wide.
+    # (Previously 200; that ended up feeling about 2x too big.)
+    castle_mn, castle_mx = scene_bounds(castle)
+    castle_w = max(1e-6, castle_mx.x - castle_mn.x)
+    castle_scale = (100.0 * 1.0) / castle_w
+
+    # Apply scaling.
+    castle_xform = Mat4.scale(castle_scale)
+    for prim in castle.primitives:
+        prim.local_to_world = castle_xform @ prim.local_to_world
+
+    # Center the castle around the origin (XZ) and put its base on y=0.
+    castle_mn, castle_mx = scene_bounds(castle)
+    castle_center = (castle_mn + castle_mx) * 0.5
+    castle_recenter = Mat4.translate(
+        -castle_center.x,
+        -castle_mn.y,
+        -castle_center.z,
+    )
+    for prim in castle.primitives:
+        prim.local_to_world = castle_recenter @ prim.local_to_world
+        # This particular castle OBJ appears to be authored with opposite winding
+        # from our glTF Mario. Keep culling enabled, but treat CW as front-facing.
+        prim.front_face_ccw = False
+    castle_mn, castle_mx = scene_bounds(castle)
+
+    # Place Mario: pick a spawn above the castle and raycast down to find ground.
+    # (Avoid spawning over empty space and falling forever.)
+    collider = build_collider_from_scene(castle)
+
+    spawn_x = 0.0
+    spawn_z = 0.0
+    y0 = float(castle_mx.y) + 50.0
+    hit_y = raycast_down_y(collider, spawn_x, spawn_z, y0, query_radius=8.0)
+    if hit_y is None:
+        # Fallback: just above the castle bounds.
+        hit_y = float(castle_mx.y) + 1.0
+    spawn = Vec3(spawn_x, hit_y + 0.02, spawn_z)
+    return castle, collider, spawn
+
+
+def bake_mario(mario: SceneData) -> SceneData:
+    """Scale Mario to 1 unit tall and pivot him at his bottom-center, in place."""
+    # Use Mario height ~= 1 world unit ("1 meter") as the baseline.
+    mario_mn, mario_mx = scene_bounds(mario)
+    mario_h = max(1e-6, mario_mx.y - mario_mn.y)
+    mario_scale = 1.0 / mario_h
+
+    mario_scale_mat = Mat4.scale(mario_scale)
+    for prim in mario.primitives:
+        prim.local_to_world = mario_scale_mat @ prim.local_to_world
+
+    # Re-center Mario around a useful pivot: bottom-center of his bounds.
+    mario_mn, mario_mx = scene_bounds(mario)
+    mario_pivot = Vec3((mario_mn.x + mario_mx.x) * 0.5, mario_mn.y, (mario_mn.z + mario_mx.z) * 0.5)
+    mario_recenter = Mat4.translate(-mario_pivot.x, -mario_pivot.y, -mario_pivot.z)
+    for prim in mario.primitives:
+        prim.local_to_world = mario_recenter @ prim.local_to_world
+    return mario
+
+
+def _load_castle_job(path: Path) -> tuple[SceneData, CastleCollider, Vec3]:
+    # Runs in a worker process; textures are decoded back in the parent.
+    return bake_castle(load_scene(path, load_textures=False))
+
+
+def _load_mario_job(path: Path) -> SceneData:
+    return bake_mario(load_scene(path, load_textures=False))
+
+
+def build_level(
+    castle_path: Path = CASTLE_PATH,
+    mario_path: Path = MARIO_PATH,
+    *,
+    jobs: int = 0,
+) -> LevelAssets:
+    """Parse the source assets and bake the runtime scale/recenter transforms.
+
+    With `jobs > 0` the castle and Mario are parsed + baked in two worker
+    processes while their textures are decoded on a `jobs`-thread pool as
+    soon as each model reports which files it needs, so a cold load takes
+    about as long as the slowest asset instead of the sum of all of them.
+    """
+    if jobs <= 0:
+        castle, collider, spawn = bake_castle(load_scene(castle_path))
+        mario = bake_mario(load_scene(mario_path))
+        return LevelAssets(castle=castle, mario=mario, collider=collider, spawn=spawn)
+
+    # "spawn" keeps workers independent of the parent's pygame/SDL state.
+    ctx = multiprocessing.get_context("spawn")
+    with (
+        ProcessPoolExecutor(max_workers=2, mp_context=ctx) as procs,
+        ThreadPoolExecutor(max_workers=jobs) as threads,
+    ):
+        castle_job = procs.submit(_load_castle_job, Path(castle_path))
+        mario_job = procs.submit(_load_mario_job, Path(mario_path))
+        decodes = TextureDecodes(threads)
+        for job in as_completed([castle_job, mario_job]):
+            result = job.result()
+            decodes.add(result[0] if job is castle_job else result)
+        decodes.finish()
+        castle, collider, spawn = castle_job.result()
+        mario = mario_job.result()
+
+    return LevelAssets(castle=castle, mario=mario, collider=collider, spawn=spawn)
+
+
+def level_sections(level: LevelAssets, *, mips: bool = False) -> dict:
+    """Pack a LevelAssets into packfile sections (see afr.models.packed)."""
+    textures = TextureTable(mips=mips)
+    castle_sections, castle_meta = pack_scene("castle", level.castle, textures)
+    mario_sections, mario_meta = pack_scene("mario", level.mario, textures)
+    collider_sections, collider_meta = pack_collider(level.collider)
+
+    sections = {}
+    sections.update(castle_sections)
+    sections.update(mario_sections)
+    sections.update(collider_sections)
+    sections.update(textures.sections())
+    sections["level.meta"] = json_section(
+        {
+            "castle": castle_meta,
+            "mario": mario_meta,
+            "collider": collider_meta,
+            "textures": textures.entries,
+            "spawn": list(level.spawn.to_tuple()),
+        }
+    )
+    return sections
+
+
+def level_from_sections(sf, *, convert: bool = True) -> LevelAssets:
+    """Rebuild a LevelAssets from `level_sections` output (see unpack_textures for `convert`)."""
+    meta = sf.json("level.meta")
+    textures = unpack_textures(meta["textures"], sf.view("tex.data"), convert=convert)
+    sx, sy, sz = meta["spawn"]
+    return LevelAssets(
+        castle=unpack_scene("castle", meta["castle"], sf, textures),
+        mario=unpack_scene("mario", meta["mario"], sf, textures),
+        collider=unpack_collider(meta["collider"], sf),
+        spawn=Vec3(sx, sy, sz),
+    )
+
+
+def cached_level(
+    cache: AssetCache, sources: list[Path], *, convert: bool = True
+) -> LevelAssets | None:
+    """The cached level for `sources`, or None on a miss.
+
+    An entry that opens but can't be unpacked (missing section, bad JSON)
+    is deleted and counts as a miss, so the caller rebuilds it.
+    """
+    sf = cache.get("level", sources, LEVEL_OPTIONS)
+    if sf is None:
+        return None
+    try:
+        with sf:
+            return level_from_sections(sf, convert=convert)
+    except (KeyError, ValueError):  # json.JSONDecodeError is a ValueError
+        cache.discard(sf)
+        return None
+
+
+def load_level(
+    castle_path: Path = CASTLE_PATH,
+    mario_path: Path = MARIO_PATH,
+    *,
+    cache: AssetCache | None = None,
+    jobs: int = 0,
+) -> LevelAssets:
+    """Load the level, going through the on-disk asset cache when possible."""
+    cache = cache if cache is not None else AssetCache()
+    sources = [Path(castle_path), Path(mario_path)]
+
+    level = cached_level(cache, sources)
+    if level is not None:
+        return level
+
+    level = build_level(castle_path, mario_path, jobs=jobs)
+    deps = level.castle.sources + level.mario.sources
+    cache.put("level", sources, LEVEL_OPTIONS, level_sections(level), deps)
+    return level
@@ -1,111 +1,368 @@
 import time
+from array import array
+
 import pygame
 
 from afr.settings import WINDOW_RES, RES
-from afr.draw import draw
+from afr.draw import draw, draw_loading
 from afr.core_rendering import draw_some_points
-from afr.linalg.vec2 import Vec2
 import afr.state as state
+from afr import pipeline_stats, profiler
 from afr.state import load
 from afr.cli import parse_args
-from afr.input import do_inputs, init_input
+from afr.input import apply_input, do_inputs, init_input, quit_requested
 from afr.physics import step_mario_physics
+from afr.present import Presenter
 
 
 def main(argv: list[str] | None = None):
     args = parse_args(argv)
 
-    state.DEFERRED_PLOTTING = bool(args.defer) or bool(args.bench_blit)
+    if args.command == "compile-assets":
+        from afr.bundle import compile_assets_main
+
+        return compile_assets_main(args)
+
+    if args.command == "render":
+        from afr.headless import render_main
+
+        return render_main(args)
+
+    if args.command == "bench":
+        from afr.bench import bench_main
+
+        return bench_main(args)
+
+    if args.command == "microbench":
+        from afr.microbench import microbench_main
+
+        return microbench_main(args)
+
+    if args.command == "golden":
+        from afr.golden import golden_main
+
+        return golden_main(args)
+
+    if args.command == "convert-model":
+        from afr.models.model import convert_model
+
+        convert_model(args.src, args.dst, binary=args.binary)
+        print(f"wrote {args.dst}")
+        return 0
+
+    state.DEFERRED_PLOTTING = (
+        bool(args.defer)
+        or bool(args.bench_blit)
+        or args.capture is not None
+        or args.play_capture is not None
+    )
     state.BLIT_PPS = max(0, int(args.blit_rate))
     state.BLIT_ACCUM = 0.0
     state.PLOT = (
         state.plot_deferred if state.DEFERRED_PLOTTING else state.plot_immediate
     )
 
+    if args.texture_budget_mb is not None:
+        from afr.models.textures import TEXTURES
+
+        TEXTURES.set_budget(int(args.texture_budget_mb * (1 << 20)))
+
     pygame.init()
     clock = pygame.time.Clock()
 
     window = pygame.display.set_mode(WINDOW_RES.to_tuple())
+    presenter = Presenter(window)
     # Use an RGBA surface so textured triangles can alpha-blend correctly.
     render_surface = pygame.Surface(RES.to_tuple(), flags=pygame.SRCALPHA, depth=32)
     app_state = state.AppState()
-    load(app_state)
+    streamer = None
+    if args.stream and args.bundle is None:
+        from afr.linalg.vec3 import Vec3
+        from afr.models.cache import AssetCache
+        from afr.streaming import LevelStreamer
+
+        streamer = LevelStreamer(
+            cache=AssetCache(enabled=not args.no_cache), jobs=args.load_jobs
+        ).start()
+        app_state.mario_pos = Vec3(0.0, 1.0, 10.0)
+    else:
+        load(
+            app_state,
+            use_cache=not args.no_cache,
+            bundle=args.bundle,
+            jobs=args.load_jobs,
+        )
+    residency = None
+    if args.texture_residency_mb is not None:
+        import afr.rendering as rendering
+        from afr.models.textures import TEXTURES
+        from afr.residency import TextureResidency
+
+        residency = TextureResidency(
+            int(args.texture_residency_mb * (1 << 20)),
+            evict_after=args.texture_evict_frames,
+        )
+        rendering.TEXTURE_RESIDENCY = residency
+        if streamer is None:
+            residency.register([app_state.castle_scene, app_state.mario_scene])
+            # The residency manager owns the decoded surfaces from here on.
+            TEXTURES.clear()
+    recorder = input_replay = None
+    if args.replay is not None:
+        from afr.input_log import InputPlayer
+
+        input_replay = InputPlayer(args.replay)
+        app_state.mouse_look = input_replay.mouse_look
+    elif args.record is not None:
+        from afr.input_log import InputRecorder
+
+        recorder = InputRecorder(args.record, mouse_look=app_state.mouse_look)
     init_input(app_state)
 
+    bench_xy = bench_rgba = None
     if args.bench_blit:
         # Pre-fill a lot of pixels so the queue stays non-empty long enough to
-        # observe a stable throughput plateau.
+        # observe a stable throughput plateau. Built once, re-enqueued in bulk.
         w = render_surface.get_width()
         h = render_surface.get_height()
         n = max(0, int(args.bench_pixels))
         # Keep memory sane if someone passes a huge number accidentally.
         n = min(n, 5_000_000)
-        for i in range(n):
-            x = i % w
-            y = (i // w) % h
-            state.POINTS.append((Vec2(x, y), (255, 255, 255)))
+        bench_xy = array("I", (((i // w) % h) << 16 | (i % w) for i in range(n)))
+        bench_rgba = array("I", [0xFFFFFFFF]) * n
+        state.POINTS.extend(bench_xy, bench_rgba)
+
+    player = None
+    if args.play_capture is not None:
+        from afr.capture import CapturePlayer
+
+        player = CapturePlayer(args.play_capture)
+        state.CLEAR_COLOR = player.clear_color
 
-    # Stats (effective drain throughput).
+    # --stats: per-stage profiler + overlay, plus drain throughput and pipeline counters.
+    prof = None
+    if args.stats:
+        prof = profiler.Profiler()
+        profiler.PROFILER = prof
+    pstats = None
+    if args.stats or args.overdraw:
+        pstats = pipeline_stats.PipelineStats(overdraw=args.overdraw)
+        pipeline_stats.STATS = pstats
+    tracer = None
+    if args.trace is not None:
+        from afr.trace import Tracer
+
+        tracer = Tracer(args.trace, flush_frames=args.trace_flush_frames)
+        profiler.TRACER = tracer
     stat_t0 = time.perf_counter()
     stat_pixels = 0
     stat_peak_pps = 0.0
 
+    # Physics at a fixed rate, Mario drawn interpolated between ticks (0 = one
+    # variable-length step per rendered frame).
+    stepper = None
+    prev_pos = app_state.mario_pos
+    if args.physics_hz > 0:
+        from afr.timestep import FixedTimestep, lerp_pos
+
+        stepper = FixedTimestep(hz=args.physics_hz)
+
+    # --target-fps: adapt the internal render size to the measured frame time.
+    dynres = None
+    render_size = render_surface.get_size()
+    if args.target_fps > 0:
+        if state.DEFERRED_PLOTTING:
+            print("--target-fps ignored: the deferred pixel queue is tied to one frame size")
+        else:
+            from afr.dynres import ResolutionController
+
+            dynres = ResolutionController(
+                args.target_fps, render_size, min_scale=args.min_res_scale
+            )
+
+    renderer = None
+    sim_frames = 0
+    if args.render_thread:
+        if state.DEFERRED_PLOTTING:
+            print("--render-thread ignored: deferred plotting drains on the main thread")
+        elif residency is not None:
+            # Residency ages textures in main-loop frames and installs reloads
+            # between them; the worker's draws don't line up with either.
+            print("--render-thread ignored: not supported with --texture-residency-mb")
+        else:
+            from afr.render_thread import FrameSnapshot, RenderThread
+
+            renderer = RenderThread(RES.to_tuple(), overdraw=args.overdraw).start()
+
+    captured = False
     running = True
     while running:
+        if input_replay is not None and input_replay.done:
+            break
         ms = clock.tick(args.fps) if args.fps > 0 else clock.tick()
         dt = ms / 1000.0
-        running = do_inputs(app_state, dt)
-        step_mario_physics(app_state, dt)
+        work_t0 = time.perf_counter()
+        if prof is not None:
+            prof.begin_frame()
+        if tracer is not None:
+            tracer.begin("frame")
+        if streamer is not None and not streamer.done:
+            if streamer.poll(app_state):
+                # Mario may have moved to the level spawn; don't interpolate from the old spot.
+                prev_pos = app_state.mario_pos
+                if streamer.done and residency is not None:
+                    from afr.models.textures import TEXTURES
 
-        if not state.DEFERRED_PLOTTING:
+                    residency.register([app_state.castle_scene, app_state.mario_scene])
+                    TEXTURES.clear()
+        with profiler.scope("input"):
+            if input_replay is not None:
+                frame = input_replay.next_frame()
+                # Simulate with the recorded dt so the run is reproducible.
+                dt = frame.dt
+                running = apply_input(app_state, frame) and not quit_requested()
+            else:
+                running = do_inputs(app_state, dt, recorder)
+        with profiler.scope("physics"):
+            if stepper is None:
+                step_mario_physics(app_state, dt)
+            else:
+                for _ in range(stepper.advance(dt)):
+                    prev_pos = app_state.mario_pos
+                    step_mario_physics(app_state, stepper.step)
+                app_state.mario_render_pos = lerp_pos(prev_pos, app_state.mario_pos, stepper.alpha)
+
+        drained = 0
+        frame_surface = render_surface
+        if renderer is not None:
+            # Hand the frame to the render thread; present whatever it finished last.
+            sim_frames += 1
+            renderer.publish(
+                FrameSnapshot.capture(
+                    app_state, sim_frames, pygame.time.get_ticks() / 1000.0, render_size
+                )
+            )
+            taken = renderer.take_frame()
+            frame_surface = taken[1] if taken is not None else None
+            if taken is not None and dynres is not None:
+                # The render cost lives on the worker; steer by its frame time.
+                dynres.update(renderer.last_frame_ms)
+                render_size = dynres.size
+        elif not state.DEFERRED_PLOTTING:
             render_surface.fill((0, 0, 0, 255))
-            draw(render_surface, app_state)
+            with profiler.scope("draw"):
+                draw(render_surface, app_state)
+            if args.overdraw:
+                pipeline_stats.draw_overdraw(render_surface, pstats)
         else:  # deferred mode
             if args.bench_blit:
                 # Keep the queue non-empty so the benchmark measures steady-state drain.
                 if not state.POINTS:
-                    w = render_surface.get_width()
-                    h = render_surface.get_height()
-                    n = max(0, int(args.bench_pixels))
-                    n = min(n, 5_000_000)
-                    for i in range(n):
-                        x = i % w
-                        y = (i // w) % h
-                        state.POINTS.append((Vec2(x, y), (255, 255, 255)))
-
-                drained = draw_some_points(render_surface, dt, stats=args.stats)
-                if args.stats:
-                    stat_pixels += drained
+                    state.POINTS.extend(bench_xy, bench_rgba)
+            elif player is not None:
+                # Replay a capture instead of rendering; loop when it ends.
+                if player.done and not state.POINTS:
+                    player.rewind()
+                if player.played == 0 and not state.POINTS:
+                    state.NEEDS_CLEAR = True
+                want = int(state.BLIT_ACCUM + state.BLIT_PPS * dt) + 1
+                if len(state.POINTS) < want:
+                    player.feed(state.POINTS, max(4096, want - len(state.POINTS)))
             else:
                 # Normal deferred behavior: only enqueue a new "frame" when the queue is empty,
                 # then drain it gradually.
                 if not state.POINTS:
                     state.NEEDS_CLEAR = True
-                    draw(render_surface, app_state)
-                drained = draw_some_points(render_surface, dt, stats=args.stats)
-                if args.stats:
-                    stat_pixels += drained
+                    with profiler.scope("draw"):
+                        draw(render_surface, app_state)
+                    if args.capture is not None and not captured:
+                        from afr.capture import write_capture
 
-        stretched_surface = pygame.transform.scale(
-            render_surface, WINDOW_RES.to_tuple()
-        )
-        window.blit(stretched_surface, (0, 0))
-        pygame.display.update()
+                        count = write_capture(
+                            args.capture,
+                            state.POINTS,
+                            render_surface.get_width(),
+                            render_surface.get_height(),
+                            clear_color=state.CLEAR_COLOR,
+                        )
+                        print(f"wrote {args.capture} ({count} pixels)")
+                        captured = True
+            with profiler.scope("drain"):
+                drained = draw_some_points(render_surface, dt)
+
+        if frame_surface is not None:
+            loading = streamer is not None and not streamer.done
+            if loading:
+                draw_loading(frame_surface, streamer.progress, streamer.status)
+
+            # Deferred frames only change when pixels were drained; the
+            # loading bar and the overlay change every frame.
+            changed = not state.DEFERRED_PLOTTING or drained > 0 or loading or prof is not None
+            presenter.present(frame_surface, changed=changed, overlay=prof)
+        if residency is not None:
+            residency.end_frame()
+        if dynres is not None and renderer is None:
+            if dynres.update((time.perf_counter() - work_t0) * 1000.0):
+                render_size = dynres.size
+                render_surface = pygame.Surface(render_size, flags=pygame.SRCALPHA, depth=32)
+        if tracer is not None:
+            tracer.end("frame")
+            tracer.end_frame()
 
-        if args.stats and state.DEFERRED_PLOTTING:
+        if prof is not None:
+            prof.end_frame()
+            stat_pixels += drained
             now = time.perf_counter()
             elapsed = now - stat_t0
             if elapsed >= 1.0:
-                pps = stat_pixels / elapsed if elapsed > 0 else 0.0
-                stat_peak_pps = max(stat_peak_pps, pps)
-                qlen = len(state.POINTS)
-                fps = clock.get_fps()
-                print(
-                    f"fps={fps:5.1f} drained_pps={pps:10.1f} peak_pps={stat_peak_pps:10.1f} queue={qlen}"
-                )
+                if state.DEFERRED_PLOTTING:
+                    pps = stat_pixels / elapsed
+                    stat_peak_pps = max(stat_peak_pps, pps)
+                    prof.counters["drain"] = (
+                        f"{pps:,.0f} px/s (peak {stat_peak_pps:,.0f}) queue={len(state.POINTS)}"
+                    )
+                if residency is not None:
+                    prof.counters["residency"] = residency.stats()
+                prof.counters["pipeline"], prof.counters["pixels"] = pstats.summary()
+                if dynres is not None:
+                    prof.counters["resolution"] = dynres.stats()
+                prof.counters["present"] = presenter.stats()
+                if renderer is not None:
+                    prof.counters["render thread"] = (
+                        f"{renderer.rendered} frames drawn for {sim_frames} simulated, "
+                        f"last {renderer.last_frame_ms:.1f} ms"
+                    )
+                if stepper is not None:
+                    prof.counters["physics"] = (
+                        f"{stepper.hz:g} Hz, {stepper.steps} ticks, {stepper.dropped} dropped"
+                    )
                 stat_t0 = now
                 stat_pixels = 0
 
+    if renderer is not None:
+        renderer.stop()
+    if recorder is not None:
+        recorder.close()
+        print(f"wrote {args.record} ({recorder.frames} frames)")
+    if input_replay is not None:
+        print(f"replayed {input_replay.played}/{len(input_replay)} frames ({input_replay.duration:.1f}s of input)")
+    if residency is not None:
+        residency.shutdown()
+    if player is not None:
+        player.close()
+    if tracer is not None:
+        profiler.TRACER = None
+        tracer.close()
+        print(f"wrote {args.trace} ({tracer.events} events)")
+    pipeline_stats.STATS = None
+    if prof is not None:
+        from afr.models.textures import TEXTURES
+
+        profiler.PROFILER = None
+        prof.counters["textures"] = TEXTURES.stats()
+        print(prof.report())
+        if renderer is not None and renderer.profiler is not None:
+            print("render thread " + renderer.profiler.report())
     pygame.quit()
 
 
@@ -0,0 +1,296 @@
+"""Function-level micro-benchmarks (`afr microbench`)."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable
+
+import pygame
+
+MICROBENCH_VERSION = 2
+SIZE = (240, 160)
+
+
+@dataclass
+class Case:
+    name: str
+    # Runs the operation once.
+    fn: Callable[[], None]
+    # Work done per call: pixels plotted (unit "px") or operations ("op").
+    work: int = 1
+    unit: str = "op"
+    # Untimed, run before every call of `fn`.
+    setup: Callable[[], None] | None = None
+
+
+def _count_pixels(case: Case) -> int:
+    import afr.state as state
+
+    n = 0
+
+    def counting_plot(surface, pos, c) -> None:
+        nonlocal n
+        n += 1
+
+    prev = state.PLOT
+    state.PLOT = counting_plot
+    try:
+        if case.setup is not None:
+            case.setup()
+        case.fn()
+    finally:
+        state.PLOT = prev
+    return n
+
+
+def _checker(size: int = 16):
+    tex = pygame.Surface((size, size), flags=pygame.SRCALPHA, depth=32)
+    for y in range(size):
+        for x in range(size):
+            tex.set_at((x, y), (255, 255, 255, 255) if (x ^ y) & 4 else (200, 40, 40, 255))
+    return tex
+
+
+def raster_cases(size: tuple[int, int] = SIZE) -> list[Case]:
+    from afr.linalg.vec2 import Vec2
+    from afr.linalg.vec3 import Vec3
+    from afr import primitives as P
+
+    w, h = size
+    surface = pygame.Surface(size, flags=pygame.SRCALPHA, depth=32)
+    tex = _checker()
+    col = (90, 160, 220, 255)
+    uva, uvb, uvc = Vec2(0.0, 0.0), Vec2(1.0, 0.0), Vec2(0.0, 1.0)
+
+    # Triangle size classes, as fractions of the surface.
+    tris = {
+        "tiny": ((0.50, 0.50), (0.52, 0.50), (0.50, 0.53)),
+        "medium": ((0.30, 0.30), (0.55, 0.35), (0.40, 0.70)),
+        "full": ((-0.2, -0.2), (2.2, -0.2), (-0.2, 2.2)),
+        "sliver": ((0.02, 0.10), (0.98, 0.14), (0.02, 0.12)),
+    }
+    lines = {
+        "short": ((0.50, 0.50), (0.54, 0.53)),
+        "long": ((0.0, 0.0), (0.99, 0.99)),
+    }
+    circles = {"tiny": 2, "medium": 16, "full": max(w, h) // 2}
+
+    # One shared z-buffer, cleared (untimed) before every call so every
+    # pixel passes the depth test.
+    zbuf = [float("inf")] * (w * h)
+    cleared = list(zbuf)
+
+    def clear_zbuf() -> None:
+        zbuf[:] = cleared
+
+    cases = []
+    for cls, pts in tris.items():
+        a2, b2, c2 = (Vec2(x * w, y * h) for x, y in pts)
+        a3, b3, c3 = (Vec3(x * w, y * h, 0.5) for x, y in pts)
+        cases += [
+            Case(f"triangle_filled/{cls}", lambda a=a2, b=b2, c=c2: P.triangle_filled(surface, a, b, c, col)),
+            Case(
+                f"triangle_filled_scanline/{cls}",
+                lambda a=a2, b=b2, c=c2: P.triangle_filled_scanline(surface, a, b, c, col),
+            ),
+            Case(
+                f"triangle_filled_z/{cls}",
+                lambda a=a3, b=b3, c=c3: P.triangle_filled_z(surface, a, b, c, col, zbuf),
+                setup=clear_zbuf,
+            ),
+            Case(
+                f"triangle_textured_z/{cls}",
+                lambda a=a3, b=b3, c=c3: P.triangle_textured_z(
+                    surface, a, b, c, uva, uvb, uvc, tex, zbuf
+                ),
+                setup=clear_zbuf,
+            ),
+        ]
+    for cls, (pa, pb) in lines.items():
+        a, b = Vec2(pa[0] * w, pa[1] * h), Vec2(pb[0] * w, pb[1] * h)
+        cases += [
+            Case(f"line/{cls}", lambda a=a, b=b: P.line(surface, a, b, col)),
+            Case(f"rline/{cls}", lambda a=a, b=b: P.rline(surface, a, b)),
+        ]
+    center = Vec2(w // 2, h // 2)
+    for cls, r in circles.items():
+        cases.append(Case(f"circle_fill_raster/{cls}", lambda r=r: P.circle_fill_raster(surface, center, r, col)))
+
+    for case in cases:
+        case.unit = "px"
+        case.work = _count_pixels(case)
+    return cases
+
+
+def linalg_cases() -> list[Case]:
+    import math
+
+    from afr.linalg.mat4 import Mat4
+    from afr.linalg.vec3 import Vec3
+    from afr.linalg.vec4 import Vec4
+    from afr.physics import _closest_point_on_triangle
+
+    m1 = Mat4.perspective(math.radians(65.0), 1.5, 0.1, 100.0)
+    m2 = Mat4.look_at(Vec3(1.0, 2.0, 3.0), Vec3(0.0, 0.0, 0.0), Vec3(0.0, 1.0, 0.0))
+    v4 = Vec4(0.3, -1.2, 4.5, 1.0)
+    a = Vec3(0.3, -1.2, 4.5)
+    b = Vec3(-2.0, 0.5, 1.25)
+    t0, t1, t2 = Vec3(0.0, 0.0, 0.0), Vec3(1.0, 0.0, 0.0), Vec3(0.0, 0.0, 1.0)
+    # One query per Voronoi region class: face interior, edge, vertex.
+    queries = (Vec3(0.2, 1.0, 0.2), Vec3(0.5, 1.0, -1.0), Vec3(-1.0, 1.0, -1.0))
+
+    def closest() -> None:
+        for q in queries:
+            _closest_point_on_triangle(q, t0, t1, t2)
+
+    return [
+        Case("mat4@mat4", lambda: m1 @ m2),
+        Case("mat4@vec4", lambda: m1 @ v4),
+        Case("vec3+vec3", lambda: a + b),
+        Case("vec3*scalar", lambda: a * 1.5),
+        Case("vec3.dot", lambda: a.dot(b)),
+        Case("vec3.cross", lambda: a.cross(b)),
+        Case("vec3.norm", lambda: a.norm()),
+        Case("closest_point_on_triangle", closest, work=len(queries)),
+    ]
+
+
+def _run_loops(case: Case, loops: int) -> float:
+    """Seconds spent in `case.fn` over `loops` calls (setup excluded)."""
+    fn = case.fn
+    setup = case.setup
+    perf_counter = time.perf_counter
+    if setup is None:
+        t0 = perf_counter()
+        for _ in range(loops):
+            fn()
+        return perf_counter() - t0
+    total = 0.0
+    for _ in range(loops):
+        setup()
+        t0 = perf_counter()
+        fn()
+        total += perf_counter() - t0
+    return total
+
+
+def time_case(case: Case, *, repeats: int = 5, min_time: float = 0.05) -> dict:
+    """Calibrate a loop count, then time `repeats` runs of it."""
+    loops = 1
+    while True:
+        dt = _run_loops(case, loops)
+        if dt >= min_time or loops >= 1 << 24:
+            break
+        loops *= 2 if dt <= 0 else max(2, min(10, int(min_time / dt) + 1))
+
+    per_call = []
+    for _ in range(repeats):
+        per_call.append(_run_loops(case, loops) / loops)
+
+    median = statistics.median(per_call)
+    row = {
+        "unit": case.unit,
+        "work": case.work,
+        "loops": loops,
+        "median_s": median,
+        "min_s": min(per_call),
+        "rel_stdev": statistics.stdev(per_call) / median if len(per_call) > 1 and median else 0.0,
+    }
+    if case.unit == "px":
+        row["px_per_s"] = case.work / median if median else 0.0
+    else:
+        row["ns_per_op"] = median * 1e9 / max(1, case.work)
+    return row
+
+
+def run_microbench(
+    patterns: list[str] | None = None,
+    *,
+    repeats: int = 5,
+    min_time: float = 0.05,
+    size: tuple[int, int] = SIZE,
+) -> dict:
+    """Time every case whose name matches one of the glob `patterns` (all if None)."""
+    import afr.state as state
+
+    prev_plot = state.PLOT
+    state.PLOT = state.plot_immediate
+    try:
+        cases = raster_cases(size) + linalg_cases()
+        if patterns:
+            cases = [c for c in cases if any(fnmatch(c.name, p) for p in patterns)]
+        results = {c.name: time_case(c, repeats=repeats, min_time=min_time) for c in cases}
+    finally:
+        state.PLOT = prev_plot
+    return {
+        "version": MICROBENCH_VERSION,
+        "config": {"repeats": repeats, "min_time": min_time, "size": list(size)},
+        "env": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def _score(row: dict) -> float:
+    """Seconds per unit of work (lower is better), comparable across units."""
+    return row["median_s"] / max(1, row["work"])
+
+
+def print_report(result: dict) -> None:
+    for name, row in result["results"].items():
+        if row["unit"] == "px":
+            value = f"{row['px_per_s']:>14,.0f} px/s  ({row['work']} px)"
+        else:
+            value = f"{row['ns_per_op']:>14,.0f} ns/op"
+        print(f"{name:<34} {value}  ±{100.0 * row['rel_stdev']:.1f}%")
+
+
+def compare(result: dict, baseline: dict) -> float:
+    """Print per-case changes against `baseline`; returns the worst slowdown in %."""
+    worst = float("-inf")
+    base = baseline["results"]
+    for name, row in result["results"].items():
+        if name not in base:
+            continue
+        pct = 100.0 * (_score(row) - _score(base[name])) / _score(base[name])
+        worst = max(worst, pct)
+        print(f"{name:<34} {pct:+7.1f}% time per {row['unit']}")
+    return worst
+
+
+def microbench_main(args) -> int:
+    from afr.headless import init_headless
+
+    init_headless()
+    result = run_microbench(
+        args.filter or None,
+        repeats=args.repeats,
+        min_time=args.min_time,
+        size=tuple(args.size),
+    )
+    print_report(result)
+
+    if args.json is not None:
+        Path(args.json).write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"wrote {args.json}")
+
+    status = 0
+    if args.baseline is not None:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print(f"vs {args.baseline}:")
+        worst = compare(result, baseline)
+        if args.fail_over is not None and worst > args.fail_over:
+            print(f"FAIL: a case slowed down by {worst:.1f}% (limit {args.fail_over:.1f}%)")
+            status = 1
+
+    pygame.quit()
+    return status
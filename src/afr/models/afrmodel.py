@@ -11,28 +11,42 @@ from afr.models.model import Model
 def load_afrmodel(path: str | Path) -> SceneData:
     """Load .afrmodel and convert to engine Mesh/Primitive.
 
-    Note: .afrmodel stores UVs per-face. For simplicity we unindex into a
-    per-vertex UV stream so the renderer can use per-vertex attributes.
+    Note: .afrmodel stores UVs per-face. We build an indexed mesh keyed by
+    (vertex, uv), so a vertex is only split where the faces sharing it
+    disagree about its UV (a seam).
     """
     m = Model.load(path)
 
-    out_pos = []
-    out_uv = []
-    out_idx = []
-
-    if m.uvs and len(m.uvs) == len(m.faces):
-        for fi, (i1, i2, i3) in enumerate(m.faces):
-            uv1, uv2, uv3 = m.uvs[fi]
-            base = len(out_pos)
-            out_pos.extend([m.verts[i1], m.verts[i2], m.verts[i3]])
-            out_uv.extend([uv1, uv2, uv3])
-            out_idx.append((base + 0, base + 1, base + 2))
+    verts = m.verts
+    faces = m.face_array
+    uvs = m.uv_array
+
+    if len(uvs) and len(uvs) == len(faces) * 2:
+        out_pos = []
+        out_uv = []
+        out_idx = []
+        remap: dict[tuple[int, float, float], int] = {}
+        corner = []
+        for fi in range(0, len(faces), 3):
+            corner.clear()
+            for k in range(3):
+                vi = faces[fi + k]
+                u = uvs[(fi + k) * 2]
+                v = uvs[(fi + k) * 2 + 1]
+                key = (vi, u, v)
+                ni = remap.get(key)
+                if ni is None:
+                    ni = len(out_pos)
+                    remap[key] = ni
+                    out_pos.append(verts[vi])
+                    out_uv.append(Vec2(u, v))
+                corner.append(ni)
+            out_idx.append((corner[0], corner[1], corner[2]))
     else:
-        out_pos = m.verts
+        out_pos = list(verts)
         out_uv = None
-        out_idx = m.faces
+        out_idx = list(m.faces)
 
     mesh = Mesh(positions=out_pos, uvs=out_uv, indices=out_idx)
     prim = Primitive(mesh=mesh, material=Material(name=Path(path).stem), local_to_world=Mat4.identity())
-    return SceneData(primitives=[prim])
-
+    return SceneData(primitives=[prim], sources=[Path(path)])
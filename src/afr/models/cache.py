@@ -0,0 +1,120 @@
+"""Content-addressed on-disk cache for compiled assets (`.afrcache`)."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from afr.models.packfile import SectionFile, json_section, write_sections
+
+CACHE_MAGIC = b"AFRCACHE"
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("AFR_CACHE_DIR", Path(__file__).resolve().parents[3] / ".afrcache")
+)
+
+
+def file_digest(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _dep_record(path: Path) -> dict:
+    st = path.stat()
+    return {
+        "path": str(path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": file_digest(path),
+    }
+
+
+def _dep_is_fresh(dep: dict) -> bool:
+    p = Path(dep["path"])
+    try:
+        st = p.stat()
+    except OSError:
+        return False
+    if st.st_size != dep["size"]:
+        return False
+    if st.st_mtime_ns == dep["mtime_ns"]:
+        return True
+    # Touched but maybe not modified: fall back to the content hash.
+    return file_digest(p) == dep["sha256"]
+
+
+class AssetCache:
+    """Directory of `.afrcache` entries.
+
+    `get()` returns an open `SectionFile` for a fresh entry (or None), and
+    `put()` writes one. With `enabled=False` every lookup misses and nothing
+    is written, which is what `--no-cache` uses.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, *, enabled: bool = True):
+        self.root = Path(root)
+        self.enabled = enabled
+
+    def key(self, kind: str, sources: list[Path], options: dict) -> str:
+        h = hashlib.sha256()
+        h.update(f"{kind}\0v{CACHE_VERSION}\0".encode("utf-8"))
+        h.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+        for src in sources:
+            h.update(b"\0")
+            h.update(file_digest(src).encode("ascii"))
+        return h.hexdigest()[:32]
+
+    def entry_path(self, kind: str, key: str) -> Path:
+        return self.root / f"{kind}-{key}.afrcache"
+
+    def get(self, kind: str, sources: list[Path], options: dict) -> SectionFile | None:
+        if not self.enabled:
+            return None
+        path = self.entry_path(kind, self.key(kind, sources, options))
+        if not path.exists():
+            return None
+        try:
+            sf = SectionFile(path, CACHE_MAGIC)
+        except (OSError, ValueError):
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            fresh = sf.version == CACHE_VERSION and all(
+                _dep_is_fresh(d) for d in sf.json("cache.deps")
+            )
+        except (KeyError, TypeError, ValueError):
+            # Missing or corrupt deps record (json errors are ValueErrors).
+            fresh = False
+        if not fresh:
+            sf.close()
+            path.unlink(missing_ok=True)
+            return None
+        return sf
+
+    def discard(self, sf: SectionFile) -> None:
+        """Close and delete an entry from `get()` that failed to unpack."""
+        sf.close()
+        sf.path.unlink(missing_ok=True)
+
+    def put(
+        self,
+        kind: str,
+        sources: list[Path],
+        options: dict,
+        sections: dict,
+        deps: list[Path],
+    ) -> Path | None:
+        if not self.enabled:
+            return None
+        path = self.entry_path(kind, self.key(kind, sources, options))
+        unique = list(dict.fromkeys(Path(d).resolve() for d in deps))
+        out = dict(sections)
+        out["cache.deps"] = json_section([_dep_record(d) for d in unique])
+        write_sections(path, CACHE_MAGIC, CACHE_VERSION, out)
+        return path
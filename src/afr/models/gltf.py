@@ -5,11 +5,10 @@ import json
 import struct
 from pathlib import Path
 
-import pygame
-
 from afr.linalg.mat4 import Mat4
 from afr.linalg.vec2 import Vec2
 from afr.linalg.vec3 import Vec3
+from afr.models.textures import load_surface
 from afr.scene import Material, Mesh, Primitive, SceneData, Texture
 
 
@@ -120,13 +119,7 @@ def _read_accessor(gltf: dict, buffers: list[bytes], accessor_idx: int) -> list:
     return out
 
 
-def _load_image_surface(img_uri: str, base_dir: Path):
-    p = base_dir / img_uri
-    surf = pygame.image.load(str(p))
-    if pygame.display.get_surface() is not None:
-        surf = surf.convert_alpha()
-    return surf
-def load_gltf_scene(path: str | Path) -> SceneData:
+def load_gltf_scene(path: str | Path, *, load_textures: bool = True) -> SceneData:
     """Load a subset of glTF 2.0 (enough to view textured static meshes).
 
     Supports:
@@ -134,19 +127,24 @@ def load_gltf_scene(path: str | Path) -> SceneData:
     - node hierarchy with TRS or matrix
     - mesh primitives with POSITION, TEXCOORD_0, and indices
     - baseColorTexture images (png/jpg)
+
+    `load_textures=False` leaves texture surfaces undecoded (path only).
     """
     p = Path(path)
     base_dir = p.parent
     gltf = json.loads(p.read_text(encoding="utf-8"))
 
     buffers = [_load_buffer(b["uri"], base_dir) for b in gltf.get("buffers", [])]
+    sources: list[Path] = [p] + [
+        base_dir / b["uri"] for b in gltf.get("buffers", []) if not b["uri"].startswith("data:")
+    ]
 
     # Load textures (image surfaces) referenced by materials.
     images = gltf.get("images", [])
     textures = gltf.get("textures", [])
     materials = gltf.get("materials", [])
 
-    image_surfaces: list[object | None] = [None] * len(images)
+    image_textures: list[Texture | None] = [None] * len(images)
 
     def material_for_index(mat_idx: int) -> Material:
         m = Material()
@@ -167,12 +165,15 @@ def load_gltf_scene(path: str | Path) -> SceneData:
         src_idx = int(textures[tex_idx].get("source", -1))
         if src_idx < 0 or src_idx >= len(images):
             return m
-        if image_surfaces[src_idx] is None:
+        if image_textures[src_idx] is None:
             uri = images[src_idx].get("uri")
             if uri is None:
                 return m
-            image_surfaces[src_idx] = _load_image_surface(uri, base_dir)
-        m.base_color_tex = Texture(image_surfaces[src_idx])
+            img_path = base_dir / uri
+            surf = load_surface(img_path) if load_textures else None
+            image_textures[src_idx] = Texture(surf, path=img_path)
+            sources.append(img_path)
+        m.base_color_tex = image_textures[src_idx]
         return m
 
     # Traverse the scene graph and collect primitives.
@@ -228,4 +229,4 @@ def load_gltf_scene(path: str | Path) -> SceneData:
     for n in root_nodes:
         visit(int(n), ident)
 
-    return SceneData(primitives=prims)
+    return SceneData(primitives=prims, sources=sources)
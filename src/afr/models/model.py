@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from afr.linalg.vec2 import Vec2
 from afr.linalg.vec3 import Vec3
+from afr.models.packfile import SectionFile, read_magic, write_sections
+
+# Binary .afrmodel ("v2"): a packfile with little-endian float32 "verts"
+# (x,y,z per vertex), uint32 "faces" (i1,i2,i3 per face) and float32 "uvs"
+# (u1,v1,u2,v2,u3,v3 per face) sections, 16-byte aligned for zero-copy mmap.
+BINARY_MAGIC = b"AFRMODEL"
+BINARY_VERSION = 2
+
+_SECTION_KIND = {"verts": "vert", "faces": "face", "uvs": "uv"}
 
 
 @dataclass
@@ -15,6 +25,47 @@ class _Line:
     comment: str | None = None  # without leading '#'
 
 
+class _Lines(list):
+    """list of _Line that tells its owning Model when it is mutated.
+
+    Lets Model cache the parsed verts/faces/uvs and drop the cache only when a
+    section's lines change. (Mutating a `_Line` in place is not tracked.)
+    """
+
+    def __init__(self, items=(), on_change=None):
+        super().__init__(items)
+        self._on_change = on_change
+
+
+def _mutator(name: str):
+    base = getattr(list, name)
+
+    def method(self, *args, **kwargs):
+        if self._on_change is not None:
+            self._on_change()
+        return base(self, *args, **kwargs)
+
+    method.__name__ = name
+    return method
+
+
+for _name in (
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+):
+    setattr(_Lines, _name, _mutator(_name))
+
+
 def _split_comment(line: str) -> tuple[str, str | None]:
     if "#" not in line:
         return line, None
@@ -23,6 +74,24 @@ def _split_comment(line: str) -> tuple[str, str | None]:
     return code, (c if c else None)
 
 
+def _verts_from_array(a) -> list[Vec3]:
+    return [Vec3(a[i], a[i + 1], a[i + 2]) for i in range(0, len(a), 3)]
+
+
+def _faces_from_array(a) -> list[tuple[int, int, int]]:
+    return [(a[i], a[i + 1], a[i + 2]) for i in range(0, len(a), 3)]
+
+
+def _uvs_from_array(a) -> list[tuple[Vec2, Vec2, Vec2]]:
+    return [
+        (Vec2(a[i], a[i + 1]), Vec2(a[i + 2], a[i + 3]), Vec2(a[i + 4], a[i + 5]))
+        for i in range(0, len(a), 6)
+    ]
+
+
+_FROM_ARRAY = {"verts": _verts_from_array, "faces": _faces_from_array, "uvs": _uvs_from_array}
+
+
 def _fmt_num(x: float) -> str:
     # Keep files readable: ints as ints, otherwise trimmed floats.
     if abs(x - round(x)) < 1e-9:
@@ -46,6 +115,11 @@ class Model:
         uvs
         u1 v1 u2 v2 u3 v3   # one line per face
         ...
+
+    There is also a binary variant for shipping (see BINARY_MAGIC). `load`
+    detects it from the file header, and `save` writes whichever format the
+    model was loaded from unless told otherwise. Comments only survive in
+    the text format.
     """
 
     def __init__(
@@ -55,9 +129,15 @@ class Model:
         uvs: list[tuple[Vec2, Vec2, Vec2]] | None = None,
     ):
         self.preamble: list[_Line] = []
-        self.verts_lines: list[_Line] = []
-        self.faces_lines: list[_Line] = []
-        self.uvs_lines: list[_Line] = []
+        # Parsed views of the *_lines lists, rebuilt lazily after a change.
+        # Keys: "verts"/"faces"/"uvs" (object lists) and "*_array" (packed).
+        self._cache: dict[str, object] = {}
+        self.verts_lines = []
+        self.faces_lines = []
+        self.uvs_lines = []
+        # True when loaded from (and by default saved as) the binary format.
+        self.binary = False
+        self._mapped: SectionFile | None = None
 
         if verts is not None:
             self.verts = verts
@@ -66,9 +146,64 @@ class Model:
         if uvs is not None:
             self.uvs = uvs
 
+    def _section_lines(self, section: str) -> list[_Line]:
+        lines = self.__dict__[f"_{section}_lines"]
+        if lines is None:
+            # Binary-loaded section: only materialize _Line objects on demand.
+            kind = _SECTION_KIND[section]
+            data = self._cached(section, kind)
+            lines = _Lines((_Line(kind, d) for d in data), lambda: self._invalidate(section))
+            self.__dict__[f"_{section}_lines"] = lines
+        return lines
+
+    def _set_section_lines(self, section: str, lines) -> None:
+        self._invalidate(section)
+        self.__dict__[f"_{section}_lines"] = _Lines(lines, lambda: self._invalidate(section))
+
+    def _invalidate(self, section: str) -> None:
+        self._cache.pop(section, None)
+        self._cache.pop(f"{section}_array", None)
+
+    def _cached(self, section: str, kind: str) -> list:
+        data = self._cache.get(section)
+        if data is None:
+            if self.__dict__[f"_{section}_lines"] is None:
+                data = _FROM_ARRAY[section](self._cache[f"{section}_array"])
+            else:
+                data = [ln.data for ln in self._section_lines(section) if ln.kind == kind]
+            self._cache[section] = data
+        return data
+
+    @property
+    def verts_lines(self) -> list[_Line]:
+        return self._section_lines("verts")
+
+    @verts_lines.setter
+    def verts_lines(self, lines: list[_Line]) -> None:
+        self._set_section_lines("verts", lines)
+
+    @property
+    def faces_lines(self) -> list[_Line]:
+        return self._section_lines("faces")
+
+    @faces_lines.setter
+    def faces_lines(self, lines: list[_Line]) -> None:
+        self._set_section_lines("faces", lines)
+
+    @property
+    def uvs_lines(self) -> list[_Line]:
+        return self._section_lines("uvs")
+
+    @uvs_lines.setter
+    def uvs_lines(self, lines: list[_Line]) -> None:
+        self._set_section_lines("uvs", lines)
+
+    # The list-valued accessors return a cached list: treat it as read-only and
+    # edit the model through the setters or *_lines instead.
+
     @property
     def verts(self) -> list[Vec3]:
-        return [ln.data for ln in self.verts_lines if ln.kind == "vert"]
+        return self._cached("verts", "vert")
 
     @verts.setter
     def verts(self, vs: list[Vec3]) -> None:
@@ -76,7 +211,7 @@ class Model:
 
     @property
     def faces(self) -> list[tuple[int, int, int]]:
-        return [ln.data for ln in self.faces_lines if ln.kind == "face"]
+        return self._cached("faces", "face")
 
     @faces.setter
     def faces(self, fs: list[tuple[int, int, int]]) -> None:
@@ -84,21 +219,88 @@ class Model:
 
     @property
     def uvs(self) -> list[tuple[Vec2, Vec2, Vec2]]:
-        return [ln.data for ln in self.uvs_lines if ln.kind == "uv"]
+        return self._cached("uvs", "uv")
 
     @uvs.setter
     def uvs(self, us: list[tuple[Vec2, Vec2, Vec2]]) -> None:
         self.uvs_lines = [_Line("uv", u) for u in us]
 
+    @property
+    def vert_array(self) -> array | memoryview:
+        """Packed x,y,z per vertex.
+
+        float64 (`array("d")`) for text models; for binary .afrmodel files a
+        zero-copy float32 view of the mapped file (typecode/format "f").
+        """
+        a = self._cache.get("verts_array")
+        if a is None:
+            a = array("d")
+            for v in self.verts:
+                a.extend((v.x, v.y, v.z))
+            self._cache["verts_array"] = a
+        return a
+
+    @property
+    def face_array(self) -> array | memoryview:
+        """Packed uint32 i1,i2,i3 per face (a view of the mapped file for binary models)."""
+        a = self._cache.get("faces_array")
+        if a is None:
+            a = array("I")
+            for f in self.faces:
+                a.extend(f)
+            self._cache["faces_array"] = a
+        return a
+
+    @property
+    def uv_array(self) -> array | memoryview:
+        """Packed u1,v1,u2,v2,u3,v3 per face; float64 or float32 as for `vert_array`."""
+        a = self._cache.get("uvs_array")
+        if a is None:
+            a = array("d")
+            for t1, t2, t3 in self.uvs:
+                a.extend((t1.x, t1.y, t2.x, t2.y, t3.x, t3.y))
+            self._cache["uvs_array"] = a
+        return a
+
+    def _count(self, section: str) -> int:
+        if self.__dict__[f"_{section}_lines"] is None:
+            stride = 6 if section == "uvs" else 3
+            return len(self._cache[f"{section}_array"]) // stride
+        return len(self._cached(section, _SECTION_KIND[section]))
+
     def validate(self) -> None:
-        if self.uvs and len(self.uvs) != len(self.faces):
-            raise ValueError(
-                f"uvs count ({len(self.uvs)}) must match faces count ({len(self.faces)})"
-            )
+        n_uvs = self._count("uvs")
+        n_faces = self._count("faces")
+        if n_uvs and n_uvs != n_faces:
+            raise ValueError(f"uvs count ({n_uvs}) must match faces count ({n_faces})")
 
     @classmethod
     def load(cls, path: str | Path) -> "Model":
         p = Path(path)
+        if read_magic(p) == BINARY_MAGIC:
+            return cls._load_binary(p)
+        return cls._load_text(p)
+
+    @classmethod
+    def _load_binary(cls, p: Path) -> "Model":
+        sf = SectionFile(p, BINARY_MAGIC)
+        if sf.version != BINARY_VERSION:
+            sf.close()
+            raise ValueError(f"{p}: unsupported afrmodel version {sf.version}")
+        m = cls()
+        m.binary = True
+        # Views alias the mapping, so keep it open for the model's lifetime.
+        m._mapped = sf
+        for section in ("verts", "faces", "uvs"):
+            m.__dict__[f"_{section}_lines"] = None
+            m._cache[f"{section}_array"] = sf.view(section)
+        if len(m.vert_array) % 3 or len(m.face_array) % 3 or len(m.uv_array) % 6:
+            raise ValueError(f"{p}: truncated afrmodel sections")
+        m.validate()
+        return m
+
+    @classmethod
+    def _load_text(cls, p: Path) -> "Model":
         text = p.read_text(encoding="utf-8")
         m = cls()
 
@@ -158,9 +360,21 @@ class Model:
         m.validate()
         return m
 
-    def save(self, path: str | Path) -> None:
+    def save(self, path: str | Path, *, binary: bool | None = None) -> None:
         self.validate()
         p = Path(path)
+        if self.binary if binary is None else binary:
+            write_sections(
+                p,
+                BINARY_MAGIC,
+                BINARY_VERSION,
+                {
+                    "verts": array("f", self.vert_array),
+                    "faces": array("I", self.face_array),
+                    "uvs": array("f", self.uv_array),
+                },
+            )
+            return
 
         def emit_line(out: list[str], line: _Line) -> None:
             if line.kind == "blank":
@@ -215,3 +429,9 @@ class Model:
         out.append("")
         p.write_text("\n".join(out), encoding="utf-8")
 
+
+def convert_model(src: str | Path, dst: str | Path, *, binary: bool | None = None) -> Model:
+    """Convert between text and binary .afrmodel (default: the other format)."""
+    m = Model.load(src)
+    m.save(dst, binary=(not m.binary) if binary is None else binary)
+    return m
@@ -3,19 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
-import pygame
-
 from afr.linalg.vec3 import Vec3
+from afr.models.textures import load_surface
 from afr.scene import Material, Texture
 
 
-def _load_texture(path: Path):
-    surf = pygame.image.load(str(path))
-    if pygame.display.get_surface() is not None:
-        surf = surf.convert_alpha()
-    return surf
-
-
 def _resolve_texture(tex_name: str, search_dirs: list[Path]) -> Path | None:
     # Keep it simple: exact filename lookup across a few dirs.
     for d in search_dirs:
@@ -25,13 +17,21 @@ def _resolve_texture(tex_name: str, search_dirs: list[Path]) -> Path | None:
     return None
 
 
-def load_mtl(path: str | Path, *, extra_texture_dirs: list[Path] | None = None) -> dict[str, Material]:
+def load_mtl(
+    path: str | Path,
+    *,
+    extra_texture_dirs: list[Path] | None = None,
+    load_textures: bool = True,
+) -> dict[str, Material]:
     """Load a minimal subset of Wavefront .mtl (enough for base color textures).
 
     Supports:
     - newmtl
     - Kd (diffuse color)
     - map_Kd (diffuse/base color texture)
+
+    With `load_textures=False` textures are only resolved to a path (surface
+    None); see afr.models.textures.decode_textures.
     """
     p = Path(path)
     base_dir = p.parent
@@ -72,7 +72,8 @@ def load_mtl(path: str | Path, *, extra_texture_dirs: list[Path] | None = None)
             tex_name = args[-1]
             tex_path = _resolve_texture(tex_name, tex_dirs)
             if tex_path is not None:
-                current.base_color_tex = Texture(_load_texture(tex_path))
+                surf = load_surface(tex_path) if load_textures else None
+                current.base_color_tex = Texture(surf, path=tex_path)
 
     return mats
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from array import array
 from pathlib import Path
+from typing import Callable, Iterator
 
 from afr.linalg.mat4 import Mat4
 from afr.linalg.vec2 import Vec2
@@ -17,7 +19,50 @@ def _parse_index(s: str, n: int) -> int:
     return i - 1
 
 
-def load_obj(path: str | Path, *, flip_v: bool = True) -> SceneData:
+# Default read size for streaming mode. Big enough to amortize syscalls, small
+# enough that the raw text never dominates peak memory.
+STREAM_CHUNK_SIZE = 1 << 20
+
+
+def _iter_lines_chunked(
+    path: Path,
+    chunk_size: int,
+    progress: Callable[[int, int], None] | None,
+) -> Iterator[str]:
+    """Yield decoded lines from `path`, reading fixed-size byte chunks.
+
+    A partial line at the end of a chunk is carried over and completed by the
+    next chunk, so only one chunk (plus one line) is ever held at a time.
+    `progress(bytes_read, total_bytes)` is called after each chunk is parsed.
+    """
+    total = path.stat().st_size
+    done = 0
+    tail = b""
+    with path.open("rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            done += len(chunk)
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for ln in lines:
+                yield ln.decode("utf-8", errors="ignore")
+            if progress is not None:
+                progress(done, total)
+    if tail:
+        yield tail.decode("utf-8", errors="ignore")
+
+
+def load_obj(
+    path: str | Path,
+    *,
+    flip_v: bool = True,
+    load_textures: bool = True,
+    stream: bool = False,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    progress: Callable[[int, int], None] | None = None,
+) -> SceneData:
     """Load a minimal subset of Wavefront OBJ (+MTL).
 
     Supports:
@@ -25,6 +70,13 @@ def load_obj(path: str | Path, *, flip_v: bool = True) -> SceneData:
     - f with v/vt or v
     - mtllib (best-effort resolution)
     - usemtl (splits into primitives by material)
+
+    With `stream=True` the file is read in `chunk_size` byte chunks instead of
+    being materialized as one string + list of lines, so peak memory tracks the
+    size of the output mesh rather than the size of the file. `progress` is
+    called as `progress(bytes_read, total_bytes)` while streaming.
+
+    `load_textures=False` leaves texture surfaces undecoded (path only).
     """
     p = Path(path)
     base_dir = p.parent
@@ -32,11 +84,14 @@ def load_obj(path: str | Path, *, flip_v: bool = True) -> SceneData:
     tex_dir = proj_root / "assets" / "textures"
     mtl_dir = proj_root / "assets" / "materials"
 
-    positions: list[Vec3] = []
-    uvs: list[Vec2] = []
+    # Shared vertex pools, packed (x, y, z, x, y, z, ...) so huge scans don't
+    # pay for one Python object per coordinate.
+    positions = array("d")
+    uvs = array("d")
 
     materials: dict[str, Material] = {}
     current_mtl = "default"
+    sources: list[Path] = [p]
 
     # Per material group we build a separate mesh with unified indexing.
     groups: dict[str, dict] = {}
@@ -45,17 +100,25 @@ def load_obj(path: str | Path, *, flip_v: bool = True) -> SceneData:
         g = groups.get(name)
         if g is None:
             g = {
-                "v": [],  # positions
-                "vt": [],  # uvs
-                "idx": [],  # triangle indices
+                "v": array("d"),  # packed positions
+                "vt": array("d"),  # packed uvs
+                "idx": array("I"),  # packed triangle indices
                 "map": {},  # (pi, ti) -> new index
             }
             groups[name] = g
         return g
 
-    for raw in p.read_text(encoding="utf-8", errors="ignore").splitlines():
+    if stream:
+        lines = _iter_lines_chunked(p, max(1, int(chunk_size)), progress)
+    else:
+        lines = p.read_text(encoding="utf-8", errors="ignore").splitlines()
+
+    for raw in lines:
+        if "#" in raw:
+            # Full-line or trailing comment ("v 1 2 3  # top left").
+            raw = raw[: raw.index("#")]
         line = raw.strip()
-        if not line or line.startswith("#"):
+        if not line:
             continue
         parts = line.split()
         if not parts:
@@ -70,7 +133,14 @@ def load_obj(path: str | Path, *, flip_v: bool = True) -> SceneData:
             if not cand.exists():
                 cand = mtl_dir / mtl_name
             if cand.exists():
-                materials.update(load_mtl(cand, extra_texture_dirs=[base_dir, tex_dir, mtl_dir]))
+                sources.append(cand)
+                materials.update(
+                    load_mtl(
+                        cand,
+                        extra_texture_dirs=[base_dir, tex_dir, mtl_dir],
+                        load_textures=load_textures,
+                    )
+                )
             continue
 
         if cmd == "usemtl" and args:
@@ -78,7 +148,7 @@ def load_obj(path: str | Path, *, flip_v: bool = True) -> SceneData:
             continue
 
         if cmd == "v" and len(args) >= 3:
-            positions.append(Vec3(float(args[0]), float(args[1]), float(args[2])))
+            positions.extend((float(args[0]), float(args[1]), float(args[2])))
             continue
 
         if cmd == "vt" and len(args) >= 2:
@@ -88,46 +158,58 @@ def load_obj(path: str | Path, *, flip_v: bool = True) -> SceneData:
             v = float(args[1])
             if flip_v:
                 v = 1.0 - v
-            uvs.append(Vec2(u, v))
+            uvs.extend((u, v))
             continue
 
         if cmd == "f" and len(args) >= 3:
+            n_pos = len(positions) // 3
+            n_uv = len(uvs) // 2
             # Triangulate polygon by fan.
             verts = []
             for tok in args:
                 # token like v/vt/vn or v/vt or v
                 fields = tok.split("/")
-                vi = _parse_index(fields[0], len(positions))
-                ti = _parse_index(fields[1], len(uvs)) if len(fields) >= 2 and fields[1] else None
+                vi = _parse_index(fields[0], n_pos)
+                ti = _parse_index(fields[1], n_uv) if len(fields) >= 2 and fields[1] else None
+                if not 0 <= vi < n_pos:
+                    raise ValueError(f"{p}: face references missing vertex: {tok!r}")
                 verts.append((vi, ti))
 
             g = group(current_mtl)
             for i in range(1, len(verts) - 1):
                 tri = (verts[0], verts[i], verts[i + 1])
-                out_idx = []
                 for (vi, ti) in tri:
                     key = (vi, ti)
                     mi = g["map"].get(key)
                     if mi is None:
-                        mi = len(g["v"])
+                        mi = len(g["v"]) // 3
                         g["map"][key] = mi
-                        g["v"].append(positions[vi])
-                        if ti is not None and ti < len(uvs):
-                            g["vt"].append(uvs[ti])
+                        g["v"].extend(positions[vi * 3 : vi * 3 + 3])
+                        if ti is not None and 0 <= ti < n_uv:
+                            g["vt"].extend(uvs[ti * 2 : ti * 2 + 2])
                         else:
-                            g["vt"].append(Vec2(0.0, 0.0))
-                    out_idx.append(mi)
-                g["idx"].append((out_idx[0], out_idx[1], out_idx[2]))
+                            g["vt"].extend((0.0, 0.0))
+                    g["idx"].append(mi)
             continue
 
+    for mat in materials.values():
+        tex = mat.base_color_tex
+        if tex is not None and tex.path is not None and tex.path not in sources:
+            sources.append(tex.path)
+
     prims: list[Primitive] = []
     for mtl_name, g in groups.items():
         mat = materials.get(mtl_name) or Material(name=mtl_name)
+        v = g["v"]
+        vt = g["vt"]
+        idx = g["idx"]
         mesh = Mesh(
-            positions=g["v"],
-            uvs=g["vt"] if g["vt"] else None,
-            indices=g["idx"],
+            positions=[Vec3(v[i], v[i + 1], v[i + 2]) for i in range(0, len(v), 3)],
+            uvs=[Vec2(vt[i], vt[i + 1]) for i in range(0, len(vt), 2)] if vt else None,
+            indices=[(idx[i], idx[i + 1], idx[i + 2]) for i in range(0, len(idx), 3)],
         )
+        # Drop the packed buffers as soon as each mesh is built.
+        g.clear()
         prims.append(Primitive(mesh=mesh, material=mat, local_to_world=Mat4.identity()))
 
-    return SceneData(primitives=prims)
+    return SceneData(primitives=prims, sources=sources)
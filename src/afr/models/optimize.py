@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from afr.scene import Mesh
+
+# Post-transform vertex cache size we optimize for (and simulate in ACMR).
+DEFAULT_CACHE_SIZE = 16
+
+
+@dataclass
+class MeshOptStats:
+    verts_before: int
+    verts_after: int
+    tris: int
+    acmr_before: float
+    acmr_after: float
+
+
+def weld_vertices(mesh: Mesh, eps: float = 0.0) -> Mesh:
+    """Merge vertices whose position and UV agree within `eps` (per component).
+
+    `eps=0` merges bit-identical vertices only. Loaders index per
+    (position, uv) *reference*, so two OBJ `v` lines with the same coordinates
+    (or a glTF that repeats vertices) still produce separate entries. Returns
+    a new Mesh; the input is left untouched.
+    """
+    uvs = mesh.uvs
+    remap: list[int] = []
+    out_pos = []
+    out_uv = [] if uvs is not None else None
+
+    if eps <= 0.0:
+        seen: dict[tuple, int] = {}
+        for i, v in enumerate(mesh.positions):
+            if uvs is not None:
+                t = uvs[i]
+                key = (v.x, v.y, v.z, t.x, t.y)
+            else:
+                key = (v.x, v.y, v.z)
+            ni = seen.get(key)
+            if ni is None:
+                ni = len(out_pos)
+                seen[key] = ni
+                out_pos.append(v)
+                if out_uv is not None:
+                    out_uv.append(uvs[i])
+            remap.append(ni)
+    else:
+        # Bucket positions on an eps-sized grid and search the 27 neighbouring
+        # cells, so near-equal vertices straddling a cell edge still weld.
+        inv = 1.0 / eps
+        cells: dict[tuple[int, int, int], list[int]] = {}
+        for i, v in enumerate(mesh.positions):
+            cx = math.floor(v.x * inv)
+            cy = math.floor(v.y * inv)
+            cz = math.floor(v.z * inv)
+            t = uvs[i] if uvs is not None else None
+            ni = -1
+            for dz in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for dx in (-1, 0, 1):
+                        for cand in cells.get((cx + dx, cy + dy, cz + dz), ()):
+                            p = out_pos[cand]
+                            if abs(p.x - v.x) > eps or abs(p.y - v.y) > eps or abs(p.z - v.z) > eps:
+                                continue
+                            if t is not None:
+                                q = out_uv[cand]
+                                if abs(q.x - t.x) > eps or abs(q.y - t.y) > eps:
+                                    continue
+                            ni = cand
+                            break
+                        if ni >= 0:
+                            break
+                    if ni >= 0:
+                        break
+                if ni >= 0:
+                    break
+            if ni < 0:
+                ni = len(out_pos)
+                out_pos.append(v)
+                if out_uv is not None:
+                    out_uv.append(t)
+                cells.setdefault((cx, cy, cz), []).append(ni)
+            remap.append(ni)
+
+    indices = [(remap[a], remap[b], remap[c]) for (a, b, c) in mesh.indices]
+    return Mesh(positions=out_pos, uvs=out_uv, indices=indices)
+
+
+def acmr(indices: list[tuple[int, int, int]], cache_size: int = DEFAULT_CACHE_SIZE) -> float:
+    """Average cache miss ratio: vertex transforms per triangle with a FIFO cache.
+
+    1.0 means every triangle shares nothing with recent ones; ~0.5-0.7 is
+    what a well-ordered closed mesh gets.
+    """
+    if not indices:
+        return 0.0
+    fifo = [-1] * cache_size
+    in_cache: set[int] = set()
+    head = 0
+    misses = 0
+    for tri in indices:
+        for v in tri:
+            if v in in_cache:
+                continue
+            misses += 1
+            old = fifo[head]
+            if old >= 0:
+                in_cache.discard(old)
+            fifo[head] = v
+            in_cache.add(v)
+            head = (head + 1) % cache_size
+    return misses / len(indices)
+
+
+def tipsify(
+    indices: list[tuple[int, int, int]],
+    vertex_count: int,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> list[tuple[int, int, int]]:
+    """Reorder triangles for post-transform cache locality.
+
+    Sander, Nehab, Barczak, "Fast Triangle Reordering for Vertex Locality and
+    Reduced Overdraw" (2007). Fans around one vertex at a time, picking the
+    next fanning vertex among the ones just emitted that will still be in
+    the cache.
+    """
+    k = cache_size
+    adj: list[list[int]] = [[] for _ in range(vertex_count)]
+    live = [0] * vertex_count
+    for ti, tri in enumerate(indices):
+        for v in tri:
+            adj[v].append(ti)
+            live[v] += 1
+
+    cache_time = [0] * vertex_count
+    emitted = [False] * len(indices)
+    dead_end: list[int] = []
+    out: list[tuple[int, int, int]] = []
+    timestamp = k + 1
+    cursor = 0
+    f = 0 if vertex_count else -1
+
+    while f >= 0:
+        candidates: list[int] = []
+        for ti in adj[f]:
+            if emitted[ti]:
+                continue
+            emitted[ti] = True
+            tri = indices[ti]
+            out.append(tri)
+            for v in tri:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if timestamp - cache_time[v] > k:
+                    cache_time[v] = timestamp
+                    timestamp += 1
+
+        # Next fanning vertex: prefer the oldest candidate that stays in cache.
+        best = -1
+        best_p = -1
+        for v in candidates:
+            if live[v] <= 0:
+                continue
+            p = 0
+            if timestamp - cache_time[v] + 2 * live[v] <= k:
+                p = timestamp - cache_time[v]
+            if p > best_p:
+                best_p = p
+                best = v
+
+        if best < 0:
+            # Dead end: back up through recently used vertices, then scan.
+            while dead_end:
+                d = dead_end.pop()
+                if live[d] > 0:
+                    best = d
+                    break
+            while best < 0 and cursor < vertex_count:
+                if live[cursor] > 0:
+                    best = cursor
+                cursor += 1
+        f = best
+
+    return out
+
+
+def reorder_vertices(mesh: Mesh) -> Mesh:
+    """Renumber vertices in order of first use by the index list.
+
+    Unreferenced vertices are dropped.
+    """
+    remap: dict[int, int] = {}
+    for tri in mesh.indices:
+        for v in tri:
+            if v not in remap:
+                remap[v] = len(remap)
+    order = sorted(remap, key=remap.__getitem__)
+    positions = [mesh.positions[i] for i in order]
+    uvs = [mesh.uvs[i] for i in order] if mesh.uvs is not None else None
+    indices = [(remap[a], remap[b], remap[c]) for (a, b, c) in mesh.indices]
+    return Mesh(positions=positions, uvs=uvs, indices=indices)
+
+
+def optimize_mesh(
+    mesh: Mesh,
+    *,
+    weld_eps: float = 0.0,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> tuple[Mesh, MeshOptStats]:
+    """Weld -> Tipsify triangle order -> first-use vertex order."""
+    before = acmr(mesh.indices, cache_size)
+    welded = weld_vertices(mesh, weld_eps)
+    ordered = Mesh(
+        positions=welded.positions,
+        uvs=welded.uvs,
+        indices=tipsify(welded.indices, len(welded.positions), cache_size),
+    )
+    out = reorder_vertices(ordered)
+    stats = MeshOptStats(
+        verts_before=len(mesh.positions),
+        verts_after=len(out.positions),
+        tris=len(out.indices),
+        acmr_before=before,
+        acmr_after=acmr(out.indices, cache_size),
+    )
+    return out, stats
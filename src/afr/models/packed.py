@@ -0,0 +1,206 @@
+"""Scene / collider <-> packed section conversion."""
+
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+
+import pygame
+
+from afr.linalg.mat4 import Mat4
+from afr.linalg.vec2 import Vec2
+from afr.linalg.vec3 import Vec3
+from afr.physics import CastleCollider, SpatialHashXZ, Triangle
+from afr.scene import Material, Mesh, Primitive, SceneData, Texture
+
+
+class TextureTable:
+    """Deduplicates texture surfaces shared across primitives and scenes.
+
+    With `mips=True` every texture also gets a box-filtered mip chain.
+    """
+
+    def __init__(self, *, mips: bool = False):
+        self.mips = mips
+        self.entries: list[dict] = []
+        self.data = bytearray()
+        self._by_id: dict[int, int] = {}
+
+    def add(self, tex: Texture | None) -> int:
+        if tex is None:
+            return -1
+        key = id(tex.surface)
+        ti = self._by_id.get(key)
+        if ti is not None:
+            return ti
+        surf = tex.surface
+        w, h = surf.get_size()
+        raw = pygame.image.tobytes(surf, "RGBA")
+        entry = self._store(w, h, raw)
+        entry["path"] = str(tex.path) if tex.path is not None else None
+        entry["mips"] = []
+        if self.mips:
+            level = pygame.image.frombytes(raw, (w, h), "RGBA")
+            while w > 1 or h > 1:
+                w, h = max(1, w // 2), max(1, h // 2)
+                level = pygame.transform.smoothscale(level, (w, h))
+                entry["mips"].append(self._store(w, h, pygame.image.tobytes(level, "RGBA")))
+        self.entries.append(entry)
+        ti = len(self.entries) - 1
+        self._by_id[key] = ti
+        return ti
+
+    def _store(self, w: int, h: int, raw: bytes) -> dict:
+        entry = {"w": w, "h": h, "off": len(self.data), "len": len(raw)}
+        self.data += raw
+        return entry
+
+    def sections(self) -> dict:
+        return {"tex.data": bytes(self.data)}
+
+
+def unpack_textures(entries: list[dict], data, *, convert: bool = True) -> list[Texture]:
+    """Rebuild Texture objects from a `tex.data` view + its meta entries.
+
+    With `convert=False` the surfaces are plain copies even when a display
+    exists; callers off the main thread run convert_alpha later themselves.
+    """
+    has_display = convert and pygame.display.get_surface() is not None
+
+    def surface(e: dict):
+        view = data[e["off"] : e["off"] + e["len"]]
+        surf = pygame.image.frombuffer(view, (e["w"], e["h"]), "RGBA")
+        # frombuffer aliases the mapped file; take a private copy.
+        return surf.convert_alpha() if has_display else surf.copy()
+
+    out: list[Texture] = []
+    for e in entries:
+        out.append(
+            Texture(
+                surface(e),
+                path=Path(e["path"]) if e["path"] else None,
+                mips=[surface(m) for m in e.get("mips", [])],
+            )
+        )
+    return out
+
+
+def pack_scene(prefix: str, scene: SceneData, textures: TextureTable) -> tuple[dict, dict]:
+    """Pack `scene` into `{prefix}.pos/.uv/.idx` arrays.
+
+    Returns (sections, meta) where meta is JSON-serializable.
+    """
+    pos = array("d")
+    uv = array("d")
+    idx = array("I")
+    prims = []
+    for prim in scene.primitives:
+        mesh = prim.mesh
+        mat = prim.material
+        entry = {
+            "name": mat.name,
+            "base_color": list(mat.base_color.to_tuple()),
+            "tex": textures.add(mat.base_color_tex),
+            "xform": list(prim.local_to_world.m),
+            "cull": bool(prim.cull_backfaces),
+            "ccw": bool(prim.front_face_ccw),
+            "v0": len(pos) // 3,
+            "nv": len(mesh.positions),
+            "uv0": len(uv) // 2 if mesh.uvs is not None else -1,
+            "i0": len(idx) // 3,
+            "ni": len(mesh.indices),
+        }
+        for v in mesh.positions:
+            pos.extend((v.x, v.y, v.z))
+        if mesh.uvs is not None:
+            for t in mesh.uvs:
+                uv.extend((t.x, t.y))
+        for tri in mesh.indices:
+            idx.extend(tri)
+        prims.append(entry)
+
+    sections = {f"{prefix}.pos": pos, f"{prefix}.uv": uv, f"{prefix}.idx": idx}
+    meta = {"prims": prims, "sources": [str(s) for s in scene.sources]}
+    return sections, meta
+
+
+def unpack_scene(prefix: str, meta: dict, sf, textures: list[Texture]) -> SceneData:
+    pos = sf.view(f"{prefix}.pos")
+    uv = sf.view(f"{prefix}.uv")
+    idx = sf.view(f"{prefix}.idx")
+    prims: list[Primitive] = []
+    for e in meta["prims"]:
+        v0, nv = e["v0"], e["nv"]
+        positions = [
+            Vec3(pos[i], pos[i + 1], pos[i + 2]) for i in range(v0 * 3, (v0 + nv) * 3, 3)
+        ]
+        uvs = None
+        if e["uv0"] >= 0:
+            u0 = e["uv0"]
+            uvs = [Vec2(uv[i], uv[i + 1]) for i in range(u0 * 2, (u0 + nv) * 2, 2)]
+        i0, ni = e["i0"], e["ni"]
+        indices = [
+            (idx[i], idx[i + 1], idx[i + 2]) for i in range(i0 * 3, (i0 + ni) * 3, 3)
+        ]
+        r, g, b = e["base_color"]
+        mat = Material(
+            name=e["name"],
+            base_color=Vec3(r, g, b),
+            base_color_tex=textures[e["tex"]] if e["tex"] >= 0 else None,
+        )
+        prims.append(
+            Primitive(
+                mesh=Mesh(positions=positions, uvs=uvs, indices=indices),
+                material=mat,
+                local_to_world=Mat4(e["xform"]),
+                cull_backfaces=e["cull"],
+                front_face_ccw=e["ccw"],
+            )
+        )
+    return SceneData(primitives=prims, sources=[Path(s) for s in meta["sources"]])
+
+
+def pack_collider(collider: CastleCollider) -> tuple[dict, dict]:
+    tris = array("d")
+    for t in collider.tris:
+        tris.extend((t.a.x, t.a.y, t.a.z, t.b.x, t.b.y, t.b.z, t.c.x, t.c.y, t.c.z))
+
+    keys = array("i")
+    offs = array("I", [0])
+    items = array("I")
+    for (ix, iz), lst in collider.grid.cells.items():
+        keys.extend((ix, iz))
+        items.extend(lst)
+        offs.append(len(items))
+
+    sections = {"col.tris": tris, "col.keys": keys, "col.offs": offs, "col.items": items}
+    return sections, {"cell_size": collider.grid.cell_size}
+
+
+def unpack_collider(meta: dict, sf) -> CastleCollider:
+    raw = sf.view("col.tris")
+    tris: list[Triangle] = []
+    for i in range(0, len(raw), 9):
+        a = Vec3(raw[i], raw[i + 1], raw[i + 2])
+        b = Vec3(raw[i + 3], raw[i + 4], raw[i + 5])
+        c = Vec3(raw[i + 6], raw[i + 7], raw[i + 8])
+        tris.append(
+            Triangle(
+                a,
+                b,
+                c,
+                min(a.x, b.x, c.x),
+                max(a.x, b.x, c.x),
+                min(a.z, b.z, c.z),
+                max(a.z, b.z, c.z),
+            )
+        )
+
+    # Rebuild the grid directly from the stored cell table (no re-insertion).
+    grid = SpatialHashXZ(cell_size=meta["cell_size"])
+    keys = sf.view("col.keys")
+    offs = sf.view("col.offs")
+    items = sf.view("col.items")
+    for ci in range(len(offs) - 1):
+        grid.cells[(keys[ci * 2], keys[ci * 2 + 1])] = list(items[offs[ci] : offs[ci + 1]])
+    return CastleCollider(tris=tris, grid=grid)
@@ -0,0 +1,136 @@
+"""Tiny section-table container for compiled / cached binary assets."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+# magic, version, section count; then one _ENTRY per section.
+_HEADER = struct.Struct("<8sII")
+# name (NUL padded), array typecode ('B' for raw bytes), offset, size in bytes
+_ENTRY = struct.Struct("<24sc7xQQ")
+# Every section's data starts on this boundary.
+ALIGN = 16
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) & ~(ALIGN - 1)
+
+
+def _payload(data) -> tuple[str, bytes]:
+    if isinstance(data, array):
+        if sys.byteorder != "little" and data.itemsize > 1:
+            data = array(data.typecode, data)
+            data.byteswap()
+        return data.typecode, data.tobytes()
+    return "B", bytes(data)
+
+
+def json_section(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def write_sections(path: str | Path, magic: bytes, version: int, sections: dict) -> None:
+    """Write `sections` (name -> array | bytes) to `path` atomically."""
+    if len(magic) != 8:
+        raise ValueError("magic must be exactly 8 bytes")
+    p = Path(path)
+    items = [(name, *_payload(data)) for name, data in sections.items()]
+
+    offset = _align(_HEADER.size + _ENTRY.size * len(items))
+    table = []
+    for name, typecode, payload in items:
+        raw_name = name.encode("utf-8")
+        if len(raw_name) > 24:
+            raise ValueError(f"section name too long: {name!r}")
+        table.append(_ENTRY.pack(raw_name, typecode.encode("ascii"), offset, len(payload)))
+        offset = _align(offset + len(payload))
+
+    tmp = p.with_name(p.name + ".tmp")
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with tmp.open("wb") as f:
+        f.write(_HEADER.pack(magic, int(version), len(items)))
+        f.write(b"".join(table))
+        for _name, _typecode, payload in items:
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(payload)
+    os.replace(tmp, p)
+
+
+def read_magic(path: str | Path) -> bytes:
+    with Path(path).open("rb") as f:
+        return f.read(8)
+
+
+class SectionFile:
+    """Read-only, mmap-backed view of a file written by `write_sections`."""
+
+    def __init__(self, path: str | Path, magic: bytes):
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            got, version, count = _HEADER.unpack_from(self._mm, 0)
+            if got != magic:
+                raise ValueError(f"{self.path}: bad magic {got!r} (expected {magic!r})")
+            self.version = version
+            self._sections: dict[str, tuple[str, int, int]] = {}
+            for i in range(count):
+                raw_name, typecode, off, size = _ENTRY.unpack_from(
+                    self._mm, _HEADER.size + i * _ENTRY.size
+                )
+                if off + size > len(self._mm):
+                    raise ValueError(f"{self.path}: truncated section {raw_name!r}")
+                name = raw_name.rstrip(b"\0").decode("utf-8")
+                self._sections[name] = (typecode.decode("ascii"), off, size)
+        except (struct.error, UnicodeDecodeError) as e:
+            self._mm.close()
+            raise ValueError(f"{self.path}: corrupt section table") from e
+        except ValueError:
+            self._mm.close()
+            raise
+
+    def __enter__(self) -> "SectionFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sections
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._sections)
+
+    def view(self, name: str):
+        """Typed zero-copy view of a section (array copy on big-endian hosts)."""
+        typecode, off, size = self._sections[name]
+        mv = memoryview(self._mm)[off : off + size]
+        if typecode == "B":
+            return mv
+        if sys.byteorder != "little":
+            a = array(typecode)
+            a.frombytes(mv)
+            a.byteswap()
+            return a
+        return mv.cast(typecode)
+
+    def bytes(self, name: str) -> bytes:
+        _typecode, off, size = self._sections[name]
+        return self._mm[off : off + size]
+
+    def json(self, name: str):
+        return json.loads(self.bytes(name).decode("utf-8"))
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            # A caller still holds a view; the map is released with it.
+            pass
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from pathlib import Path
+
+import pygame
+
+from afr.scene import SceneData, Texture
+
+
+def finish_surface(surf):
+    # convert_alpha needs a display and must run on the thread that owns it.
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha()
+    return surf
+
+
+def surface_nbytes(surf) -> int:
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+class TextureRegistry:
+    """Process-wide cache of decoded (and convert_alpha'd) texture surfaces.
+
+    Keyed by resolved path + mtime, so every material and every level that
+    names the same file shares one surface, and an edited file is decoded
+    again. Least recently used entries are dropped once the cached surfaces
+    exceed `budget_bytes` (0 = unbounded); a dropped surface stays alive for
+    whichever Textures still hold it, it just won't be handed out again.
+    """
+
+    def __init__(self, budget_bytes: int = 0):
+        self.budget_bytes = budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[Path, int], object] = OrderedDict()
+
+    @staticmethod
+    def key(path: str | Path) -> tuple[Path, int]:
+        p = Path(path).resolve()
+        return p, os.stat(p).st_mtime_ns
+
+    def lookup(self, path: str | Path):
+        """Cached surface for `path`, or None (counted as a miss)."""
+        key = self.key(path)
+        with self._lock:
+            surf = self._entries.get(key)
+            if surf is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+    def insert(self, path: str | Path, surf):
+        """Finish and cache a freshly decoded surface; returns the cached one.
+
+        Must run on the main thread (see finish_surface). If another thread
+        inserted the same file first, that surface wins.
+        """
+        key = self.key(path)
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+        surf = finish_surface(surf)
+        with self._lock:
+            # Older versions of the same file can never be hit again.
+            for old in [k for k in self._entries if k[0] == key[0]]:
+                self._drop(old)
+            self._entries[key] = surf
+            self.nbytes += surface_nbytes(surf)
+            self._evict()
+        return surf
+
+    def load(self, path: str | Path):
+        surf = self.lookup(path)
+        if surf is None:
+            surf = self.insert(path, pygame.image.load(str(path)))
+        return surf
+
+    def set_budget(self, budget_bytes: int) -> None:
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _drop(self, key) -> None:
+        self.nbytes -= surface_nbytes(self._entries.pop(key))
+        self.evictions += 1
+
+    def _evict(self) -> None:
+        # Always keep the most recent entry, even if it alone is over budget.
+        while self.budget_bytes > 0 and self.nbytes > self.budget_bytes and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
+
+    def stats(self) -> str:
+        return (
+            f"{len(self._entries)} cached, {self.nbytes / (1 << 20):.1f} MiB, "
+            f"hits={self.hits} misses={self.misses} evictions={self.evictions}"
+        )
+
+
+# Default budget: AFR_TEXTURE_BUDGET_MB (0 = unbounded), or --texture-budget-mb.
+TEXTURES = TextureRegistry(int(float(os.environ.get("AFR_TEXTURE_BUDGET_MB", "256")) * (1 << 20)))
+
+
+def load_surface(path: Path):
+    return TEXTURES.load(path)
+
+
+def pending_textures(scenes: list[SceneData]) -> dict[Path, list[Texture]]:
+    """Textures created with load_textures=False, grouped by source path."""
+    pending: dict[Path, list[Texture]] = {}
+    for scene in scenes:
+        for prim in scene.primitives:
+            tex = prim.material.base_color_tex
+            if tex is not None and tex.surface is None and tex.path is not None:
+                group = pending.setdefault(tex.path, [])
+                if all(t is not tex for t in group):
+                    group.append(tex)
+    return pending
+
+
+class TextureDecodes:
+    """Decode pending textures on an executor as scenes become available.
+
+    pygame.image.load releases the GIL while decoding, so a thread pool
+    decodes PNGs in parallel. Each file is decoded once and the surface is
+    shared by every Texture that names it. `finish()` must run on the main
+    thread (it may call convert_alpha).
+    """
+
+    def __init__(self, executor: Executor):
+        self.executor = executor
+        self._jobs: dict[Path, tuple[Future, list[Texture]]] = {}
+
+    def add(self, scene: SceneData) -> None:
+        for path, texs in pending_textures([scene]).items():
+            job = self._jobs.get(path)
+            if job is not None:
+                job[1].extend(t for t in texs if all(t is not o for o in job[1]))
+                continue
+            surf = TEXTURES.lookup(path)
+            if surf is not None:
+                for tex in texs:
+                    tex.surface = surf
+                continue
+            self._jobs[path] = (self.executor.submit(pygame.image.load, str(path)), texs)
+
+    def finish(self) -> None:
+        for path, (future, texs) in self._jobs.items():
+            surf = TEXTURES.insert(path, future.result())
+            for tex in texs:
+                tex.surface = surf
+        self._jobs.clear()
+
+
+def decode_textures(scenes: list[SceneData]) -> None:
+    """Decode every pending texture in `scenes` on the calling thread."""
+    for p, texs in pending_textures(scenes).items():
+        surf = load_surface(p)
+        for tex in texs:
+            tex.surface = surf
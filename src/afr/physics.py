@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import math
+from time import perf_counter
 
+from afr import profiler
 from afr.linalg.vec3 import Vec3
 
 
@@ -232,6 +234,14 @@ def step_mario_physics(app_state, dt: float) -> None:
     n = max(1, min(n, 8))
     sub_dt = dt / n
 
+    # Profiling: collision time summed over the substeps (like draw_model).
+    prof = profiler.PROFILER
+    tracer = profiler.TRACER
+    timed = prof is not None or tracer is not None
+    if timed:
+        t_start = perf_counter()
+        collide_s = 0.0
+
     r2 = radius * radius
     for _step in range(n):
         # Integrate.
@@ -244,6 +254,8 @@ def step_mario_physics(app_state, dt: float) -> None:
 
         # Resolve penetrations (a couple Gauss-Seidel iterations).
         step_ground = False
+        if timed:
+            t0 = perf_counter()
         for _ in range(2):
             moved = False
             cand = collider.query_sphere(center, radius)
@@ -268,6 +280,8 @@ def step_mario_physics(app_state, dt: float) -> None:
                     step_ground = True
             if not moved:
                 break
+        if timed:
+            collide_s += perf_counter() - t0
 
         # Convert back to feet pivot.
         pos = center - Vec3(0.0, radius, 0.0)
@@ -276,6 +290,12 @@ def step_mario_physics(app_state, dt: float) -> None:
             vel = Vec3(vel.x, 0.0, vel.z)
         on_ground = step_ground or on_ground
 
+    if timed:
+        if prof is not None:
+            prof.add("physics.collide", collide_s)
+        if tracer is not None:
+            tracer.complete("physics.collide", t_start, collide_s)
+
     app_state.mario_pos = pos
     app_state.mario_vel = vel
     app_state.on_ground = on_ground
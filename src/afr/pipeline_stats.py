@@ -0,0 +1,102 @@
+"""Per-frame rendering pipeline counters and the overdraw heat map."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field, fields
+
+import pygame
+
+# The active counters, or None when counting is off. Configured by main().
+STATS: PipelineStats | None = None
+
+# Overdraw heat-map colours by write count: 0, 1, 2, ... (last = that many or more).
+OVERDRAW_PALETTE = (
+    (0, 0, 0),
+    (20, 40, 140),
+    (20, 150, 60),
+    (200, 200, 30),
+    (240, 130, 20),
+    (220, 30, 30),
+    (255, 255, 255),
+)
+
+
+@dataclass
+class PipelineStats:
+    overdraw: bool = False
+
+    # Counts for one draw() call (reset by begin_frame).
+    primitives_submitted: int = 0  # draw_model calls
+    primitives_culled: int = 0  # ... that rasterized nothing
+    triangles_in: int = 0
+    triangles_rejected: int = 0  # entirely outside the clip volume
+    triangles_accepted: int = 0  # entirely inside (no clipping)
+    triangles_clipped: int = 0  # straddling a clip plane
+    fan_triangles: int = 0  # out of the clipper
+    triangles_backfacing: int = 0
+    triangles_rasterized: int = 0
+    pixels_covered: int = 0
+    pixels_depth_passed: int = 0
+    pixels_alpha_discarded: int = 0
+    pixels_blended: int = 0
+    pixels_written: int = 0  # PLOT calls
+    texels_fetched: int = 0
+
+    # Per-pixel write counts (row-major, frame_size), when `overdraw` is on.
+    writes: array | None = field(default=None, repr=False)
+    frame_size: tuple[int, int] = (0, 0)
+
+    def begin_frame(self, w: int, h: int) -> None:
+        for name in _COUNTERS:
+            setattr(self, name, 0)
+        self.frame_size = (w, h)
+        if self.overdraw:
+            if self.writes is None or len(self.writes) != w * h:
+                self.writes = array("I", bytes(4 * w * h))
+            else:
+                self.writes[:] = array("I", bytes(4 * w * h))
+
+    def counts(self) -> dict[str, int]:
+        return {name: getattr(self, name) for name in _COUNTERS}
+
+    def overdraw_ratio(self) -> float:
+        """Pixel writes per distinct pixel written (1.0 = no overdraw)."""
+        if self.writes is None:
+            return 0.0
+        touched = len(self.writes) - self.writes.count(0)
+        return self.pixels_written / touched if touched else 0.0
+
+    def summary(self) -> tuple[str, str]:
+        """Two short lines for the profiler overlay."""
+        tris = (
+            f"tris {self.triangles_in} in, {self.triangles_rejected} rejected, "
+            f"{self.triangles_clipped} clipped, {self.triangles_backfacing} backfacing, "
+            f"{self.triangles_rasterized} drawn"
+        )
+        px = (
+            f"px {self.pixels_covered} covered, {self.pixels_depth_passed} z-pass, "
+            f"{self.pixels_written} written, {self.texels_fetched} texels"
+        )
+        if self.writes is not None:
+            px += f", overdraw {self.overdraw_ratio():.2f}x"
+        return tris, px
+
+
+# The int counter fields, in declaration order. Picked by default value
+# (`overdraw` is a bool), so it works whether or not annotations are strings.
+_COUNTERS = tuple(f.name for f in fields(PipelineStats) if type(f.default) is int)
+
+
+def draw_overdraw(surface, stats: PipelineStats) -> None:
+    """Replace `surface`'s contents with the overdraw heat map of the last frame."""
+    if stats.writes is None:
+        return
+    w, h = stats.frame_size
+    last = len(OVERDRAW_PALETTE) - 1
+    lut = [bytes(OVERDRAW_PALETTE[min(i, last)]) for i in range(256)]
+    rgb = b"".join([lut[c if c < 256 else 255] for c in stats.writes])
+    heat = pygame.image.frombuffer(rgb, (w, h), "RGB")
+    if heat.get_size() != surface.get_size():
+        heat = pygame.transform.scale(heat, surface.get_size())
+    surface.blit(heat, (0, 0))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from array import array
+
+# Records are two parallel uint32 arrays: (y << 16 | x) and packed RGBA
+# (r | g << 8 | b << 16 | a << 24, i.e. RGBA byte order on little-endian).
+# 8 bytes per queued pixel instead of a (Vec2, tuple) pair (~200 bytes).
+MAX_COORD = 0xFFFF
+
+
+def pack_rgba(c) -> int:
+    if len(c) == 4:
+        return c[0] | c[1] << 8 | c[2] << 16 | c[3] << 24
+    return c[0] | c[1] << 8 | c[2] << 16 | 0xFF000000
+
+
+def unpack_rgba(v: int) -> tuple[int, int, int, int]:
+    return v & 0xFF, (v >> 8) & 0xFF, (v >> 16) & 0xFF, v >> 24
+
+
+class PixelQueue:
+    """FIFO ring buffer of (x, y, rgba) pixel writes.
+
+    Preallocated; doubles (and unwraps) when full, so the only per-pixel
+    cost of `push` is two array stores. `drain(n)` hands back the oldest
+    records as at most two contiguous (xy, rgba) slices.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        capacity = max(1, capacity)
+        self._xy = array("I", bytes(4 * capacity))
+        self._rgba = array("I", bytes(4 * capacity))
+        self._head = 0  # oldest record
+        self._len = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._xy)
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * (self._xy.itemsize + self._rgba.itemsize)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def clear(self) -> None:
+        self._head = 0
+        self._len = 0
+
+    def _grow(self) -> None:
+        # Unwrap into a buffer twice the size: oldest record at index 0.
+        cap = self.capacity
+        split = cap - self._head
+        for name in ("_xy", "_rgba"):
+            old = getattr(self, name)
+            new = array("I", bytes(8 * cap))
+            new[:split] = old[self._head :]
+            new[split:cap] = old[: self._head]
+            setattr(self, name, new)
+        self._head = 0
+
+    def push(self, x: int, y: int, rgba: int) -> None:
+        """Enqueue one pixel. Negative / >16-bit coordinates are dropped."""
+        if x < 0 or y < 0 or x > MAX_COORD or y > MAX_COORD:
+            return
+        if self._len == len(self._xy):
+            self._grow()
+        i = self._head + self._len
+        cap = len(self._xy)
+        if i >= cap:
+            i -= cap
+        self._xy[i] = y << 16 | x
+        self._rgba[i] = rgba
+        self._len += 1
+
+    def extend(self, xy: array, rgba: array) -> None:
+        """Enqueue many pre-packed records at once (no coordinate checks)."""
+        n = len(xy)
+        while self.capacity - self._len < n:
+            self._grow()
+        cap = self.capacity
+        start = (self._head + self._len) % cap
+        first = min(n, cap - start)
+        self._xy[start : start + first] = xy[:first]
+        self._rgba[start : start + first] = rgba[:first]
+        if first < n:
+            self._xy[: n - first] = xy[first:]
+            self._rgba[: n - first] = rgba[first:]
+        self._len += n
+
+    def _slices(self, n: int) -> list[tuple[memoryview, memoryview]]:
+        cap = len(self._xy)
+        xy = memoryview(self._xy)
+        rgba = memoryview(self._rgba)
+        start = self._head
+        first = min(n, cap - start)
+        out = [(xy[start : start + first], rgba[start : start + first])]
+        if first < n:
+            out.append((xy[: n - first], rgba[: n - first]))
+        return out
+
+    def peek(self) -> list[tuple[memoryview, memoryview]]:
+        """Every queued record, oldest first, without dequeuing."""
+        return self._slices(self._len) if self._len else []
+
+    def drain(self, n: int) -> list[tuple[memoryview, memoryview]]:
+        """Dequeue up to `n` oldest records, as (xy, rgba) slices in order.
+
+        The views alias the ring buffer; use them before the next `push`.
+        """
+        n = min(n, self._len)
+        if n <= 0:
+            return []
+        out = self._slices(n)
+        self._head = (self._head + n) % len(self._xy)
+        self._len -= n
+        if self._len == 0:
+            self._head = 0
+        return out
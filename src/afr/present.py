@@ -0,0 +1,75 @@
+"""Present stage: scale the low-res frame onto the window."""
+
+from __future__ import annotations
+
+import pygame
+
+from afr import profiler
+
+
+class Presenter:
+    def __init__(self, window):
+        self.window = window
+        self.presented = 0
+        self.skipped = 0
+        # "copy", "scale" (straight into the window) or "scale+blit" (fallback).
+        self.path = ""
+        # Set per frame format by _direct_ok(); None until the first scaled frame.
+        self._direct_format = None
+        self._direct = False
+        self._scaled = None
+
+    def _scaled_surface(self, frame):
+        size = self.window.get_size()
+        s = self._scaled
+        if s is None or s.get_size() != size or s.get_flags() != frame.get_flags():
+            s = pygame.Surface(size, flags=frame.get_flags(), depth=frame.get_bitsize())
+            self._scaled = s
+        return s
+
+    def _direct_ok(self, frame) -> bool:
+        # transform.scale into the window only checks bytes per pixel and
+        # copies raw pixels, so R/G/B order must match or the channels swap.
+        fmt = (frame.get_bitsize(), frame.get_masks()[:3])
+        if fmt != self._direct_format:
+            window = self.window
+            self._direct_format = fmt
+            self._direct = fmt == (window.get_bitsize(), window.get_masks()[:3])
+        return self._direct
+
+    def _draw_frame(self, frame) -> None:
+        window = self.window
+        size = window.get_size()
+        if frame.get_size() == size:
+            window.blit(frame, (0, 0))
+            self.path = "copy"
+            return
+        if self._direct_ok(frame):
+            pygame.transform.scale(frame, size, window)
+            self.path = "scale"
+            return
+        scaled = self._scaled_surface(frame)
+        pygame.transform.scale(frame, size, scaled)
+        window.blit(scaled, (0, 0))
+        self.path = "scale+blit"
+
+    def present(self, frame, *, changed: bool = True, overlay=None) -> bool:
+        """Scale `frame` to the window, draw the profiler `overlay`, update the display.
+
+        Returns False (and does nothing) when `changed` is False.
+        """
+        if not changed:
+            self.skipped += 1
+            return False
+        with profiler.scope("present.scale"):
+            self._draw_frame(frame)
+        if overlay is not None:
+            with profiler.scope("overlay"):
+                profiler.draw_overlay(self.window, overlay)
+        with profiler.scope("present.update"):
+            pygame.display.update()
+        self.presented += 1
+        return True
+
+    def stats(self) -> str:
+        return f"{self.path or '-'}, {self.presented} presented, {self.skipped} skipped"
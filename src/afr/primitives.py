@@ -2,6 +2,7 @@ import math
 from afr.linalg.vec2 import Vec2
 from afr.linalg.vec3 import Vec3
 import afr.state as state
+from afr import pipeline_stats
 
 
 def point(surface, pos):
@@ -128,6 +129,10 @@ def triangle_filled_z(surface, a, b, c, col, zbuf):
         return
 
     inv_area = 1.0 / area
+    st = pipeline_stats.STATS
+    covered = passed = 0
+    # Overdraw is tracked for the frame surface only (not e.g. the HUD inset).
+    writes = st.writes if st is not None and (w, h) == st.frame_size else None
 
     for y in range(min_y, max_y + 1):
         py = y + 0.5
@@ -145,6 +150,8 @@ def triangle_filled_z(surface, a, b, c, col, zbuf):
 
             if not inside:
                 continue
+            if st is not None:
+                covered += 1
 
             # Barycentric weights (sum to 1).
             alpha = w0 * inv_area
@@ -156,6 +163,15 @@ def triangle_filled_z(surface, a, b, c, col, zbuf):
             if z < zbuf[idx]:
                 zbuf[idx] = z
                 cpoint(surface, Vec2(x, y), col)
+                if st is not None:
+                    passed += 1
+                    if writes is not None:
+                        writes[idx] += 1
+
+    if st is not None:
+        st.pixels_covered += covered
+        st.pixels_depth_passed += passed
+        st.pixels_written += passed
 
 
 def triangle_textured_z(
@@ -193,6 +209,10 @@ def triangle_textured_z(
 
     inv_area = 1.0 / area
     deferred = state.PLOT is state.plot_deferred
+    st = pipeline_stats.STATS
+    covered = passed = discarded = blended = 0
+    # Overdraw is tracked for the frame surface only (not e.g. the HUD inset).
+    writes = st.writes if st is not None and (w, h) == st.frame_size else None
     tex_get = texture.get_at
     surf_get = surface.get_at
 
@@ -220,6 +240,8 @@ def triangle_textured_z(
 
             if not inside:
                 continue
+            if st is not None:
+                covered += 1
 
             alpha = w0 * inv_area
             beta = w1 * inv_area
@@ -230,6 +252,8 @@ def triangle_textured_z(
             if z >= zbuf[idx]:
                 continue
             zbuf[idx] = z
+            if st is not None:
+                passed += 1
 
             u = alpha * uva.x + beta * uvb.x + gamma * uvc.x
             v = alpha * uva.y + beta * uvb.y + gamma * uvc.y
@@ -254,7 +278,11 @@ def triangle_textured_z(
             ty = int(v * (th - 1))
             r, g, b_, a_ = tex_get((tx, ty))
             if a_ == 0:
+                if st is not None:
+                    discarded += 1
                 continue
+            if writes is not None:
+                writes[idx] += 1
 
             sr = min(255, int(r * shade_r))
             sg = min(255, int(g * shade_g))
@@ -266,6 +294,8 @@ def triangle_textured_z(
                 continue
 
             # Alpha blend (source-over) in immediate mode.
+            if st is not None:
+                blended += 1
             dr, dg, db, da = surf_get((x, y))
             sa = a_ / 255.0
             inv = 1.0 - sa
@@ -275,6 +305,15 @@ def triangle_textured_z(
             out_a = int(a_ + da * inv)
             cpoint(surface, Vec2(x, y), (out_r, out_g, out_b, out_a))
 
+    if st is not None:
+        st.pixels_covered += covered
+        st.pixels_depth_passed += passed
+        # One texel per depth-passing sample (nearest filtering).
+        st.texels_fetched += passed
+        st.pixels_alpha_discarded += discarded
+        st.pixels_blended += blended
+        st.pixels_written += passed - discarded
+
 
 def triangle_filled_scanline(surface, a, b, c, col):
     """Filled triangle rasterization (simple scanline fill).
@@ -0,0 +1,171 @@
+"""Scoped frame profiler with a rolling window and an on-screen overlay."""
+
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+from threading import get_ident
+from time import perf_counter
+
+import pygame
+
+FONT_PATH = Path(__file__).resolve().parents[2] / "assets" / "fonts" / "DejaVuSans.ttf"
+
+# The active profiler, or None when profiling is off. Configured by main().
+PROFILER: Profiler | None = None
+# The active afr.trace.Tracer (--trace), or None.
+TRACER = None
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "tracer", "name", "args", "t0")
+
+    def __init__(self, profiler: Profiler | None, tracer, name: str, args: dict | None):
+        self.profiler = profiler
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = perf_counter()
+        if self.tracer is not None:
+            self.tracer.begin(self.name, self.t0, self.args)
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        t1 = perf_counter()
+        if self.profiler is not None:
+            self.profiler.add(self.name, t1 - self.t0)
+        if self.tracer is not None:
+            self.tracer.end(self.name, t1)
+        return False
+
+
+def scope(name: str, args: dict | None = None):
+    """Time the enclosed block under `name` (no-op when profiling is off).
+
+    `args` is only used by the tracer (shown on the event in the viewer).
+    """
+    prof = PROFILER
+    tracer = TRACER
+    if prof is None and tracer is None:
+        return _NULL_SCOPE
+    return _Scope(prof, tracer, name, args)
+
+
+class Profiler:
+    def __init__(self, window: int = 120):
+        self.window = window
+        self.frames: deque[dict[str, float]] = deque(maxlen=window)
+        # Free-form values shown under the timings (queue length, cache stats...).
+        self.counters: dict[str, str] = {}
+        self._current: dict[str, float] = {}
+        self._frame_t0 = perf_counter()
+        # Thread ident -> Profiler that takes that thread's times instead.
+        self._threads: dict[int, Profiler] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        if self._threads:
+            other = self._threads.get(get_ident())
+            if other is not None:
+                other.add(name, seconds)
+                return
+        cur = self._current
+        cur[name] = cur.get(name, 0.0) + seconds
+
+    def track_thread(self, other: Profiler) -> None:
+        """Route times recorded on the calling thread to `other` (which runs its own frames)."""
+        self._threads[get_ident()] = other
+
+    def begin_frame(self) -> None:
+        self._current = {}
+        self._frame_t0 = perf_counter()
+
+    def end_frame(self) -> None:
+        self._current["frame"] = perf_counter() - self._frame_t0
+        self.frames.append(self._current)
+
+    def stats(self) -> list[tuple[str, float, float]]:
+        """(name, mean ms per frame, max ms) over the window, in first-seen order."""
+        n = len(self.frames)
+        if n == 0:
+            return []
+        sums: dict[str, float] = {}
+        peaks: dict[str, float] = {}
+        for frame in self.frames:
+            for name, s in frame.items():
+                sums[name] = sums.get(name, 0.0) + s
+                if s > peaks.get(name, 0.0):
+                    peaks[name] = s
+        return [(name, 1000.0 * s / n, 1000.0 * peaks[name]) for name, s in sums.items()]
+
+    def report(self) -> str:
+        rows = self.stats()
+        if not rows:
+            return "profiler: no frames"
+        lines = [f"profiler: last {len(self.frames)} frames (mean / max ms)"]
+        for name, mean, peak in rows:
+            lines.append(f"  {name:<16} {mean:9.2f} {peak:9.2f}")
+        lines.extend(f"  {k}: {v}" for k, v in self.counters.items())
+        return "\n".join(lines)
+
+
+_fonts: dict[int, object] = {}
+
+
+def _font(size: int):
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.Font(str(FONT_PATH), size)
+        _fonts[size] = font
+    return font
+
+
+def draw_overlay(surface, profiler: Profiler, *, font_size: int = 13) -> None:
+    """Draw rolling per-stage timings as text + bars in the top-right corner."""
+    rows = profiler.stats()
+    if not rows:
+        return
+    font = _font(font_size)
+    line_h = font.get_linesize()
+    frame_ms = next((mean for name, mean, _ in rows if name == "frame"), 0.0) or 1.0
+    fps = 1000.0 / frame_ms
+
+    lines = [(f"{fps:5.1f} fps  {frame_ms:6.1f} ms/frame", None)]
+    for name, mean, peak in rows:
+        if name != "frame":
+            lines.append((f"{name:<14} {mean:7.2f} ms  max {peak:7.2f}", mean / frame_ms))
+    lines.extend((f"{k}: {v}", None) for k, v in profiler.counters.items())
+
+    texts = [(font.render(text, True, (255, 255, 255)), frac) for text, frac in lines]
+    bar_w = 60
+    panel_w = max(t.get_width() for t, _ in texts) + bar_w + 16
+    panel_h = line_h * len(texts) + 8
+    x0 = surface.get_width() - panel_w - 4
+    panel = pygame.Surface((panel_w, panel_h), flags=pygame.SRCALPHA, depth=32)
+    panel.fill((0, 0, 0, 170))
+    surface.blit(panel, (x0, 4))
+
+    y = 8
+    for text, frac in texts:
+        surface.blit(text, (x0 + 6, y))
+        if frac is not None:
+            bx = x0 + panel_w - bar_w - 6
+            pygame.draw.rect(surface, (60, 60, 60), (bx, y + 3, bar_w, line_h - 6))
+            fill = int(bar_w * min(1.0, frac))
+            if fill > 0:
+                pygame.draw.rect(surface, (240, 190, 60), (bx, y + 3, fill, line_h - 6))
+        y += line_h
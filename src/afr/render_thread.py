@@ -0,0 +1,133 @@
+"""Render worker thread fed by per-frame scene snapshots (`--render-thread`)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+import pygame
+
+from afr import pipeline_stats, profiler
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """What `draw()` reads from AppState, frozen at publish time."""
+
+    seq: int
+    t: float
+    size: tuple[int, int]  # render resolution for this frame
+    mario_pos: object  # Vec3 (already interpolated for rendering)
+    mario_yaw: float
+    cam_pitch: float
+    castle_scene: object | None
+    mario_scene: object | None
+
+    @classmethod
+    def capture(cls, app_state, seq: int, t: float, size: tuple[int, int]) -> FrameSnapshot:
+        return cls(
+            seq=seq,
+            t=t,
+            size=size,
+            mario_pos=app_state.mario_render_pos or app_state.mario_pos,
+            mario_yaw=app_state.mario_yaw,
+            cam_pitch=app_state.cam_pitch,
+            castle_scene=app_state.castle_scene,
+            mario_scene=app_state.mario_scene,
+        )
+
+
+class RenderThread:
+    def __init__(self, size: tuple[int, int], *, overdraw: bool = False):
+        self.size = size
+        self.overdraw = overdraw
+        self.rendered = 0
+        # Wall time of the worker's most recent frame (for --target-fps).
+        self.last_frame_ms = 0.0
+        self.profiler = profiler.Profiler() if profiler.PROFILER is not None else None
+        self._cond = threading.Condition()
+        self._pending: FrameSnapshot | None = None
+        self._free = [pygame.Surface(size, flags=pygame.SRCALPHA, depth=32) for _ in range(3)]
+        self._ready: tuple[int, object] | None = None
+        self._presenting = None
+        self._stop = False
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="afr-render", daemon=True)
+
+    def start(self) -> RenderThread:
+        self._thread.start()
+        return self
+
+    def publish(self, snapshot: FrameSnapshot) -> None:
+        """Make `snapshot` the next frame to draw (replacing one not yet started)."""
+        if self._error is not None:
+            raise self._error
+        with self._cond:
+            self._pending = snapshot
+            self._cond.notify()
+
+    def take_frame(self) -> tuple[int, object] | None:
+        """(seq, surface) of the newest finished frame not yet taken, or None.
+
+        The surface stays the caller's until the next successful take_frame().
+        """
+        if self._error is not None:
+            raise self._error
+        with self._cond:
+            if self._ready is None:
+                return None
+            seq, surf = self._ready
+            self._ready = None
+            if self._presenting is not None:
+                self._free.append(self._presenting)
+            self._presenting = surf
+            return seq, surf
+
+    def _run(self) -> None:
+        from afr.draw import draw
+
+        prof = self.profiler
+        if prof is not None:
+            profiler.PROFILER.track_thread(prof)
+        try:
+            while True:
+                with self._cond:
+                    while self._pending is None and not self._stop:
+                        self._cond.wait()
+                    if self._stop:
+                        return
+                    snap = self._pending
+                    self._pending = None
+                    surf = self._free.pop()
+
+                t0 = time.perf_counter()
+                if prof is not None:
+                    prof.begin_frame()
+                if surf.get_size() != snap.size:
+                    surf = pygame.Surface(snap.size, flags=pygame.SRCALPHA, depth=32)
+                surf.fill((0, 0, 0, 255))
+                with profiler.scope("render_thread.draw"):
+                    draw(surf, snap, t=snap.t)
+                if self.overdraw and pipeline_stats.STATS is not None:
+                    pipeline_stats.draw_overdraw(surf, pipeline_stats.STATS)
+                self.last_frame_ms = (time.perf_counter() - t0) * 1000.0
+                if prof is not None:
+                    prof.end_frame()
+
+                with self._cond:
+                    if self._ready is not None:
+                        # Never presented: superseded by this one.
+                        self._free.append(self._ready[1])
+                    self._ready = (snap.seq, surf)
+                    self.rendered += 1
+        except BaseException as e:
+            self._error = e
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from time import perf_counter
 
+from afr import pipeline_stats, profiler
 from afr.linalg.mat4 import Mat4
 from afr.linalg.vec2 import Vec2
 from afr.linalg.vec3 import Vec3
@@ -11,6 +13,9 @@ from afr.primitives import triangle_filled_z, triangle_textured_z
 
 BACKFACE_CULL = True
 
+# Optional afr.residency.TextureResidency; told about every texture we sample.
+TEXTURE_RESIDENCY = None
+
 
 @dataclass
 class Camera:
@@ -163,6 +168,20 @@ def draw_model(
     if zbuf is None:
         zbuf = [float("inf")] * (sw * sh)
 
+    # Profiling: vertex transform / clip+cull+project / rasterization.
+    prof = profiler.PROFILER
+    tracer = profiler.TRACER
+    timed = prof is not None or tracer is not None
+    if timed:
+        t_start = perf_counter()
+        clip_s = raster_s = 0.0
+
+    st = pipeline_stats.STATS
+    if st is not None:
+        st.primitives_submitted += 1
+        st.triangles_in += len(mesh.indices)
+        rasterized_before = st.triangles_rasterized
+
     viewproj = proj_mat @ view_mat
     verts_ms = mesh.positions
     verts_ws = [model_mat @ v for v in verts_ms]
@@ -172,21 +191,33 @@ def draw_model(
 
     tex_surface = material.base_color_tex.surface if material.base_color_tex else None
     use_tex = tex_surface is not None and mesh.uvs is not None
+    touch_tex = use_tex and TEXTURE_RESIDENCY is not None
     use_scene = scene is not None
 
+    if timed:
+        t_prev = t_vertex = perf_counter()
+
     for (i1, i2, i3) in mesh.indices:
         if use_tex:
             uv1, uv2, uv3 = mesh.uvs[i1], mesh.uvs[i2], mesh.uvs[i3]
         else:
             uv1 = uv2 = uv3 = None
 
-        poly = _clip_triangle(
-            [
-                _ClipVert(verts_clip[i1], uv1),
-                _ClipVert(verts_clip[i2], uv2),
-                _ClipVert(verts_clip[i3], uv3),
-            ]
-        )
+        tri = [
+            _ClipVert(verts_clip[i1], uv1),
+            _ClipVert(verts_clip[i2], uv2),
+            _ClipVert(verts_clip[i3], uv3),
+        ]
+        poly = _clip_triangle(tri)
+        if st is not None:
+            if len(poly) < 3:
+                st.triangles_rejected += 1
+            elif len(poly) == 3 and poly[0] is tri[0] and poly[1] is tri[1] and poly[2] is tri[2]:
+                # No plane cut it: the clipper hands the input vertices back.
+                st.triangles_accepted += 1
+            else:
+                st.triangles_clipped += 1
+            st.fan_triangles += max(0, len(poly) - 2)
         if len(poly) < 3:
             continue
 
@@ -220,20 +251,29 @@ def draw_model(
                 area = (b_ndc.x - a_ndc.x) * (c_ndc.y - a_ndc.y) - (b_ndc.y - a_ndc.y) * (
                     c_ndc.x - a_ndc.x
                 )
-                if front_face_ccw:
-                    if area <= 0.0:
-                        continue
-                else:
-                    if area >= 0.0:
-                        continue
+                backfacing = area <= 0.0 if front_face_ccw else area >= 0.0
+                if backfacing:
+                    if st is not None:
+                        st.triangles_backfacing += 1
+                    continue
 
             p1s = ndc_to_screen(a_ndc, sw, sh)
             p2s = ndc_to_screen(b_ndc, sw, sh)
             p3s = ndc_to_screen(c_ndc, sw, sh)
 
+            if timed:
+                t_now = perf_counter()
+                clip_s += t_now - t_prev
+                t_prev = t_now
+
             if use_tex:
                 if va.uv is None or vb.uv is None or vc.uv is None:
                     continue
+                if st is not None:
+                    st.triangles_rasterized += 1
+                if touch_tex:
+                    TEXTURE_RESIDENCY.touch(material.base_color_tex)
+                    touch_tex = False
                 tri_shade = shade * material.base_color
                 triangle_textured_z(
                     surface,
@@ -248,10 +288,33 @@ def draw_model(
                     shade=tri_shade,
                 )
             else:
+                if st is not None:
+                    st.triangles_rasterized += 1
                 col = (shade * material.base_color).clamp(0.0, 1.0)
                 c255 = (int(255 * col.x), int(255 * col.y), int(255 * col.z), 255)
                 triangle_filled_z(surface, p1s, p2s, p3s, c255, zbuf)
 
+            if timed:
+                t_now = perf_counter()
+                raster_s += t_now - t_prev
+                t_prev = t_now
+
+    if st is not None and st.triangles_rasterized == rasterized_before:
+        st.primitives_culled += 1
+
+    if timed:
+        # Whatever followed the last rasterized triangle (culled / clipped away).
+        clip_s += perf_counter() - t_prev
+        vertex_s = t_vertex - t_start
+        if prof is not None:
+            prof.add("model.vertex", vertex_s)
+            prof.add("model.clip", clip_s)
+            prof.add("model.raster", raster_s)
+        if tracer is not None:
+            tracer.complete("model.vertex", t_start, vertex_s)
+            tracer.complete("model.clip", t_vertex, clip_s)
+            tracer.complete("model.raster", t_vertex + clip_s, raster_s)
+
 
 def draw_primitive(
     surface,
@@ -263,15 +326,19 @@ def draw_primitive(
     scene: Scene | None = None,
     zbuf: list[float] | None = None,
 ) -> None:
-    draw_model(
-        surface,
-        prim.mesh,
-        prim.material,
-        world_mat @ prim.local_to_world,
-        view_mat,
-        proj_mat,
-        scene=scene,
-        zbuf=zbuf,
-        cull_backfaces=getattr(prim, "cull_backfaces", True),
-        front_face_ccw=getattr(prim, "front_face_ccw", True),
-    )
+    args = None
+    if profiler.TRACER is not None:
+        args = {"material": prim.material.name, "tris": len(prim.mesh.indices)}
+    with profiler.scope("draw_primitive", args):
+        draw_model(
+            surface,
+            prim.mesh,
+            prim.material,
+            world_mat @ prim.local_to_world,
+            view_mat,
+            proj_mat,
+            scene=scene,
+            zbuf=zbuf,
+            cull_backfaces=getattr(prim, "cull_backfaces", True),
+            front_face_ccw=getattr(prim, "front_face_ccw", True),
+        )
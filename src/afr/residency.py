@@ -0,0 +1,147 @@
+"""Keep only recently sampled textures decoded, within a byte budget."""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import pygame
+
+from afr.models.textures import finish_surface, surface_nbytes
+from afr.scene import SceneData, Texture
+
+
+@dataclass
+class _Entry:
+    # Every Texture decoded from the same file (they share one surface).
+    texs: list[Texture]
+    path: Path
+    standin: object
+    # Number of smoothscale mip levels the texture had when resident.
+    mip_levels: int
+    nbytes: int
+    resident: bool = True
+    last_frame: int = 0
+    pending: Future | None = None
+
+
+def build_mips(surf, levels: int) -> list[object]:
+    """Half-size chain matching afr.models.packed.TextureTable."""
+    mips = []
+    w, h = surf.get_size()
+    level = surf
+    while len(mips) < levels and (w > 1 or h > 1):
+        w, h = max(1, w // 2), max(1, h // 2)
+        level = pygame.transform.smoothscale(level, (w, h))
+        mips.append(level)
+    return mips
+
+
+def _standin(surf):
+    r, g, b, a = pygame.transform.average_color(surf)
+    out = pygame.Surface((1, 1), flags=pygame.SRCALPHA, depth=32)
+    out.fill((r, g, b, a))
+    return out
+
+
+def _texture_nbytes(tex: Texture) -> int:
+    return surface_nbytes(tex.surface) + sum(surface_nbytes(m) for m in tex.mips)
+
+
+class TextureResidency:
+    def __init__(self, budget_bytes: int, *, evict_after: int = 300, workers: int = 1):
+        self.budget_bytes = budget_bytes
+        self.evict_after = evict_after
+        self.frame = 0
+        self.resident_bytes = 0
+        self.evictions = 0
+        self.reloads = 0
+        self._entries: dict[Path, _Entry] = {}
+        self._by_tex: dict[int, _Entry] = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="afr-residency")
+
+    def register(self, scenes: list[SceneData]) -> None:
+        """Start tracking every texture in `scenes` that can be re-decoded.
+
+        Textures without a source image on disk stay resident for good.
+        """
+        for scene in scenes:
+            for prim in scene.primitives:
+                tex = prim.material.base_color_tex
+                if tex is None or tex.surface is None or tex.path is None:
+                    continue
+                if id(tex) in self._by_tex or not tex.path.exists():
+                    continue
+                path = tex.path.resolve()
+                e = self._entries.get(path)
+                if e is None:
+                    e = _Entry(
+                        texs=[],
+                        path=path,
+                        standin=_standin(tex.surface),
+                        mip_levels=len(tex.mips),
+                        nbytes=_texture_nbytes(tex),
+                        last_frame=self.frame,
+                    )
+                    self._entries[path] = e
+                    self.resident_bytes += e.nbytes
+                e.texs.append(tex)
+                self._by_tex[id(tex)] = e
+
+    def touch(self, tex: Texture) -> None:
+        e = self._by_tex.get(id(tex))
+        if e is None:
+            return
+        e.last_frame = self.frame
+        if not e.resident and e.pending is None:
+            e.pending = self._pool.submit(pygame.image.load, str(e.path))
+
+    def end_frame(self) -> None:
+        """Install finished re-decodes, then evict. Call once per frame on the main thread."""
+        for e in self._entries.values():
+            if e.pending is not None and e.pending.done():
+                surf = finish_surface(e.pending.result())
+                e.pending = None
+                mips = build_mips(surf, e.mip_levels)
+                for tex in e.texs:
+                    tex.surface = surf
+                    tex.mips = mips
+                e.nbytes = _texture_nbytes(e.texs[0])
+                e.resident = True
+                self.resident_bytes += e.nbytes
+                self.reloads += 1
+
+        resident = [e for e in self._entries.values() if e.resident]
+        for e in resident:
+            if self.frame - e.last_frame >= self.evict_after:
+                self._evict(e)
+        if self.budget_bytes > 0 and self.resident_bytes > self.budget_bytes:
+            # Oldest first; never evict what this frame sampled.
+            for e in sorted(resident, key=lambda e: e.last_frame):
+                if self.resident_bytes <= self.budget_bytes or e.last_frame >= self.frame:
+                    break
+                if e.resident:
+                    self._evict(e)
+
+        self.frame += 1
+
+    def _evict(self, e: _Entry) -> None:
+        for tex in e.texs:
+            tex.surface = e.standin
+            tex.mips = []
+        e.resident = False
+        self.resident_bytes -= e.nbytes
+        self.evictions += 1
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> str:
+        resident = sum(1 for e in self._entries.values() if e.resident)
+        pending = sum(1 for e in self._entries.values() if e.pending is not None)
+        return (
+            f"tex_resident={resident}/{len(self._entries)} "
+            f"tex_mib={self.resident_bytes / (1 << 20):.1f} "
+            f"tex_pending={pending} tex_evictions={self.evictions} tex_reloads={self.reloads}"
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from pathlib import Path
 
 from afr.linalg.mat4 import Mat4
 from afr.linalg.vec2 import Vec2
@@ -11,6 +12,10 @@ from afr.linalg.vec3 import Vec3
 class Texture:
     # For now, just wrap a pygame.Surface (kept as object to avoid importing pygame everywhere).
     surface: object
+    # Source image on disk (if any); used for cache invalidation.
+    path: Path | None = None
+    # Optional downsampled chain (half size each step, down to 1x1).
+    mips: list[object] = field(default_factory=list)
 
 
 @dataclass
@@ -43,3 +48,5 @@ class Primitive:
 @dataclass
 class SceneData:
     primitives: list[Primitive]
+    # Every file the loader read (model, materials, buffers, textures).
+    sources: list[Path] = field(default_factory=list)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pygame
+
+from afr.level import (
+    CASTLE_PATH,
+    LEVEL_OPTIONS,
+    MARIO_PATH,
+    LevelAssets,
+    bake_castle,
+    bake_mario,
+    cached_level,
+    level_sections,
+    load_scene,
+)
+from afr.models.cache import AssetCache
+from afr.models.textures import TEXTURES, finish_surface, pending_textures
+from afr.scene import Material, Primitive, SceneData, Texture
+
+# Share of the progress bar each loading stage gets.
+_CASTLE_PARSE = 0.40
+_MARIO_PARSE = 0.50
+_GEOMETRY_DONE = 0.55
+
+
+def _untextured(scene: SceneData) -> SceneData:
+    """Placeholder copy of `scene`: same meshes, flat base-color materials."""
+    prims = []
+    for prim in scene.primitives:
+        mat = prim.material
+        prims.append(
+            Primitive(
+                mesh=prim.mesh,
+                material=Material(name=mat.name, base_color=mat.base_color),
+                local_to_world=prim.local_to_world,
+                cull_backfaces=prim.cull_backfaces,
+                front_face_ccw=prim.front_face_ccw,
+            )
+        )
+    return SceneData(primitives=prims, sources=scene.sources)
+
+
+def _scene_textures(scenes: list[SceneData]) -> list[Texture]:
+    """Every distinct Texture the scenes' materials use."""
+    seen: dict[int, Texture] = {}
+    for scene in scenes:
+        for prim in scene.primitives:
+            tex = prim.material.base_color_tex
+            if tex is not None:
+                seen.setdefault(id(tex), tex)
+    return list(seen.values())
+
+
+class LevelStreamer:
+    """Load the level on a background thread while the main loop runs.
+
+    Publishes twice on a cold load: first untextured, flat-shaded geometry
+    (plus the collider, so Mario can already walk), then the fully textured
+    scenes. A warm cache hit publishes the final level once. The main loop
+    calls `poll()` every frame; it swaps `castle_scene`/`mario_scene` on the
+    main thread, so a frame never sees a half-updated level.
+    """
+
+    def __init__(
+        self,
+        castle_path: Path = CASTLE_PATH,
+        mario_path: Path = MARIO_PATH,
+        *,
+        cache: AssetCache | None = None,
+        jobs: int = 0,
+    ):
+        self.castle_path = Path(castle_path)
+        self.mario_path = Path(mario_path)
+        self.cache = cache if cache is not None else AssetCache()
+        self.jobs = jobs
+
+        self.progress = 0.0
+        self.status = "starting"
+        self.done = False
+
+        self._lock = threading.Lock()
+        self._ready: tuple[LevelAssets, bool] | None = None
+        # Decoded off-thread, still waiting for TEXTURES.insert on the main thread.
+        self._decoded: dict[Path, list] = {}
+        # Unpacked from the cache off-thread, still waiting for convert_alpha.
+        self._unconverted: list[Texture] = []
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="afr-level-stream", daemon=True)
+
+    def start(self) -> "LevelStreamer":
+        self._thread.start()
+        return self
+
+    def _set_progress(self, progress: float, status: str) -> None:
+        self.progress = progress
+        self.status = status
+
+    def _publish(self, level: LevelAssets, final: bool) -> None:
+        with self._lock:
+            self._ready = (level, final)
+
+    def _run(self) -> None:
+        try:
+            self._load()
+        except BaseException as e:  # surfaced on the main thread by poll()
+            with self._lock:
+                self._error = e
+
+    def _load(self) -> None:
+        sources = [self.castle_path, self.mario_path]
+        self._set_progress(0.0, "cache")
+        # convert_alpha must wait for the main thread (see poll()).
+        level = cached_level(self.cache, sources, convert=False)
+        if level is not None:
+            self._unconverted = _scene_textures([level.castle, level.mario])
+            self._set_progress(1.0, "ready")
+            self._publish(level, final=True)
+            return
+
+        def castle_progress(done: int, total: int) -> None:
+            self._set_progress(_CASTLE_PARSE * done / max(1, total), "castle")
+
+        self._set_progress(0.0, "castle")
+        castle, collider, spawn = bake_castle(
+            load_scene(self.castle_path, load_textures=False, progress=castle_progress)
+        )
+        self._set_progress(_CASTLE_PARSE, "mario")
+        mario = bake_mario(load_scene(self.mario_path, load_textures=False))
+        self._set_progress(_MARIO_PARSE, "geometry")
+
+        level = LevelAssets(castle=castle, mario=mario, collider=collider, spawn=spawn)
+        self._publish(
+            LevelAssets(
+                castle=_untextured(castle),
+                mario=_untextured(mario),
+                collider=collider,
+                spawn=spawn,
+            ),
+            final=False,
+        )
+        self._set_progress(_GEOMETRY_DONE, "textures")
+
+        # Decode raw surfaces here; convert_alpha happens on the main thread.
+        pending = pending_textures([castle, mario])
+        total = max(1, len(pending))
+        with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as pool:
+            futures = {}
+            for p, texs in pending.items():
+                surf = TEXTURES.lookup(p)
+                if surf is None:
+                    futures[pool.submit(pygame.image.load, str(p))] = (p, texs)
+                    continue
+                for tex in texs:
+                    tex.surface = surf
+            done = len(pending) - len(futures)
+            for i, fut in enumerate(as_completed(futures), done + 1):
+                p, texs = futures[fut]
+                surf = fut.result()
+                for tex in texs:
+                    tex.surface = surf
+                self._decoded[p] = texs
+                self._set_progress(
+                    _GEOMETRY_DONE + (1.0 - _GEOMETRY_DONE) * i / total, "textures"
+                )
+
+        deps = castle.sources + mario.sources
+        self.cache.put("level", sources, LEVEL_OPTIONS, level_sections(level), deps)
+        self._set_progress(1.0, "ready")
+        self._publish(level, final=True)
+
+    def poll(self, app_state) -> bool:
+        """Apply a newly published level to `app_state`. Returns True on swap."""
+        with self._lock:
+            error, self._error = self._error, None
+            ready, self._ready = self._ready, None
+        if error is not None:
+            self.done = True
+            raise error
+        if ready is None:
+            return False
+
+        level, final = ready
+        if final:
+            for p, texs in self._decoded.items():
+                surf = TEXTURES.insert(p, texs[0].surface)
+                for tex in texs:
+                    tex.surface = surf
+            self._decoded.clear()
+            for tex in self._unconverted:
+                tex.surface = finish_surface(tex.surface)
+                tex.mips = [finish_surface(m) for m in tex.mips]
+            self._unconverted = []
+
+        if app_state.castle_collider is None:
+            # First publish: place Mario too.
+            from afr.state import apply_level
+
+            apply_level(app_state, level)
+        else:
+            app_state.castle_scene, app_state.mario_scene = level.castle, level.mario
+
+        if final:
+            self.done = True
+        return True
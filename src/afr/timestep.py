@@ -0,0 +1,43 @@
+"""Fixed-timestep simulation clock (`--physics-hz`)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class FixedTimestep:
+    hz: float = 120.0
+    max_steps: int = 12
+    accumulator: float = 0.0
+    # Ticks run so far, and ticks dropped by the max_steps guard.
+    steps: int = 0
+    dropped: int = 0
+
+    @property
+    def step(self) -> float:
+        return 1.0 / self.hz
+
+    def advance(self, dt: float) -> int:
+        """Add a frame's dt; returns how many ticks to simulate now."""
+        step = self.step
+        self.accumulator += max(0.0, dt)
+        n = int(self.accumulator / step)
+        self.accumulator -= n * step
+        if n > self.max_steps:
+            self.dropped += n - self.max_steps
+            n = self.max_steps
+        self.steps += n
+        return n
+
+    @property
+    def alpha(self) -> float:
+        """How far (0..1) render time is between the previous and latest tick."""
+        return min(1.0, self.accumulator / self.step)
+
+
+def lerp_pos(prev, cur, alpha: float):
+    """Interpolate two Vec3 positions (returns `cur` itself when alpha is 1)."""
+    if prev is None or alpha >= 1.0:
+        return cur
+    return prev + (cur - prev) * alpha
@@ -0,0 +1,181 @@
+"""Chrome trace event export (`--trace out.json`)."""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+from array import array
+from pathlib import Path
+from time import perf_counter
+
+# Event phases (index into _PHASES).
+BEGIN = 0
+END = 1
+COMPLETE = 2
+_PHASES = "BEX"
+
+
+class _Buffer:
+    __slots__ = ("ts", "dur", "name", "phase", "args", "tid", "n")
+
+    def __init__(self, capacity: int):
+        self.ts = array("d", bytes(8 * capacity))
+        self.dur = array("d", bytes(8 * capacity))
+        self.name = array("I", bytes(4 * capacity))
+        self.phase = array("B", bytes(capacity))
+        self.args = array("i", bytes(4 * capacity))
+        self.tid = array("I", bytes(4 * capacity))
+        self.n = 0
+
+
+class Tracer:
+    def __init__(self, path: str | Path, *, capacity: int = 1 << 16, flush_frames: int = 60):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.flush_frames = flush_frames
+        self.events = 0
+        self._buf = _Buffer(capacity)
+        self._names: list[str] = []
+        self._name_ids: dict[str, int] = {}
+        self._args: list[str] = []
+        self._args_ids: dict[str, int] = {}
+        self._tids: dict[int, int] = {}
+        self._frames = 0
+        self._t0 = perf_counter()
+        self._queue: queue.Queue = queue.Queue()
+        # Scopes may be entered from several threads (loader, render thread).
+        self._lock = threading.RLock()
+        self._error: BaseException | None = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+        self._file.write('{"traceEvents":[\n')
+        self._file.write(
+            json.dumps({"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "afr"}})
+        )
+        self._thread = threading.Thread(target=self._run, name="afr-trace-writer", daemon=True)
+        self._thread.start()
+
+    def _name_id(self, name: str) -> int:
+        i = self._name_ids.get(name)
+        if i is None:
+            i = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = i
+        return i
+
+    def _args_id(self, args: dict | None) -> int:
+        if args is None:
+            return -1
+        key = json.dumps(args, separators=(",", ":"))
+        i = self._args_ids.get(key)
+        if i is None:
+            i = len(self._args)
+            self._args.append(key)
+            self._args_ids[key] = i
+        return i
+
+    def _tid(self) -> int:
+        ident = threading.get_ident()
+        t = self._tids.get(ident)
+        if t is None:
+            t = len(self._tids) + 1
+            self._tids[ident] = t
+            name = threading.current_thread().name
+            self._record(-1.0, 0.0, self._name_id(f"thread_name:{name}"), 3, -1, t)
+        return t
+
+    def _record(self, ts: float, dur: float, name_id: int, phase: int, args_id: int, tid: int) -> None:
+        buf = self._buf
+        i = buf.n
+        if i == self.capacity:
+            self.flush()
+            buf = self._buf
+            i = 0
+        buf.ts[i] = ts
+        buf.dur[i] = dur
+        buf.name[i] = name_id
+        buf.phase[i] = phase
+        buf.args[i] = args_id
+        buf.tid[i] = tid
+        buf.n = i + 1
+        self.events += 1
+
+    def begin(self, name: str, ts: float | None = None, args: dict | None = None) -> None:
+        ts = perf_counter() if ts is None else ts
+        with self._lock:
+            self._record(ts, 0.0, self._name_id(name), BEGIN, self._args_id(args), self._tid())
+
+    def end(self, name: str, ts: float | None = None) -> None:
+        ts = perf_counter() if ts is None else ts
+        with self._lock:
+            self._record(ts, 0.0, self._name_id(name), END, -1, self._tid())
+
+    def complete(self, name: str, ts: float, dur: float, args: dict | None = None) -> None:
+        with self._lock:
+            self._record(ts, dur, self._name_id(name), COMPLETE, self._args_id(args), self._tid())
+
+    def end_frame(self) -> None:
+        self._frames += 1
+        if self.flush_frames > 0 and self._frames % self.flush_frames == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand the filled buffer to the writer thread and start a fresh one."""
+        if self._error is not None:
+            raise self._error
+        with self._lock:
+            buf = self._buf
+            if buf.n == 0:
+                return
+            self._buf = _Buffer(self.capacity)
+        self._queue.put(buf)
+
+    def _format(self, buf: _Buffer) -> str:
+        pid = os.getpid()
+        names = self._names
+        args = self._args
+        t0 = self._t0
+        out = []
+        for i in range(buf.n):
+            phase = buf.phase[i]
+            if phase == 3:
+                # Thread name metadata.
+                out.append(
+                    f',\n{{"name":"thread_name","ph":"M","pid":{pid},"tid":{buf.tid[i]},'
+                    f'"args":{{"name":{json.dumps(names[buf.name[i]].split(":", 1)[1])}}}}}'
+                )
+                continue
+            ev = (
+                f',\n{{"name":{json.dumps(names[buf.name[i]])},"ph":"{_PHASES[phase]}",'
+                f'"ts":{(buf.ts[i] - t0) * 1e6:.3f},"pid":{pid},"tid":{buf.tid[i]}'
+            )
+            if phase == COMPLETE:
+                ev += f',"dur":{buf.dur[i] * 1e6:.3f}'
+            if buf.args[i] >= 0:
+                ev += f',"args":{args[buf.args[i]]}'
+            out.append(ev + "}")
+        return "".join(out)
+
+    def _run(self) -> None:
+        while True:
+            buf = self._queue.get()
+            if buf is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                self._file.write(self._format(buf))
+            except BaseException as e:
+                self._error = e
+
+    def close(self) -> None:
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.write("\n]}\n")
+        self._file.close()
+        if self._error is not None:
+            raise self._error
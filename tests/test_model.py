@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from afr.linalg.vec2 import Vec2
+from afr.linalg.vec3 import Vec3
+from afr.models.model import Model
+
+
+def _typecode(a) -> str:
+    return a.typecode if hasattr(a, "typecode") else a.format
+
+
+class ModelArrayTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.model = Model(
+            verts=[Vec3(0.0, 0.0, 0.0), Vec3(1.0, 0.0, 0.0), Vec3(0.0, 1.0, 0.0)],
+            faces=[(0, 1, 2)],
+            uvs=[(Vec2(0.0, 0.0), Vec2(1.0, 0.0), Vec2(0.0, 0.1))],
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_text_model_arrays_are_float64(self):
+        path = self.dir / "tri.afrmodel"
+        self.model.save(path, binary=False)
+        m = Model.load(path)
+        self.assertEqual(_typecode(m.vert_array), "d")
+        self.assertEqual(_typecode(m.uv_array), "d")
+        self.assertEqual(list(m.uv_array)[5], 0.1)
+
+    def test_binary_model_arrays_are_float32(self):
+        path = self.dir / "tri.afrmodel"
+        self.model.save(path, binary=True)
+        m = Model.load(path)
+        self.assertTrue(m.binary)
+        self.assertEqual(_typecode(m.vert_array), "f")
+        self.assertEqual(_typecode(m.uv_array), "f")
+        self.assertEqual(_typecode(m.face_array), "I")
+        self.assertEqual(list(m.vert_array), [0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0])
+        self.assertAlmostEqual(m.uv_array[5], 0.1, places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
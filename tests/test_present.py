@@ -0,0 +1,48 @@
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from afr.present import Presenter
+
+
+class PresenterTest(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        pygame.display.set_mode((8, 8))
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def frame(self, color):
+        surf = pygame.Surface((2, 2), flags=pygame.SRCALPHA, depth=32)
+        surf.fill(color)
+        return surf
+
+    def test_swapped_masks_keep_colors(self):
+        # R in the low byte: the opposite of the frame's ARGB layout.
+        window = pygame.Surface((8, 8), 0, 32, (0xFF, 0xFF00, 0xFF0000, 0))
+        presenter = Presenter(window)
+        presenter.present(self.frame((255, 0, 0, 255)))
+        self.assertEqual(presenter.path, "scale+blit")
+        self.assertEqual(tuple(window.get_at((5, 5)))[:3], (255, 0, 0))
+
+    def test_matching_format_scales_directly(self):
+        frame = self.frame((0, 128, 255, 255))
+        window = pygame.Surface((8, 8), flags=pygame.SRCALPHA, depth=32)
+        presenter = Presenter(window)
+        presenter.present(frame)
+        self.assertEqual(presenter.path, "scale")
+        self.assertEqual(tuple(window.get_at((7, 0)))[:3], (0, 128, 255))
+
+    def test_unchanged_frame_is_skipped(self):
+        window = pygame.Surface((8, 8), flags=pygame.SRCALPHA, depth=32)
+        presenter = Presenter(window)
+        self.assertFalse(presenter.present(self.frame((1, 2, 3, 255)), changed=False))
+        self.assertEqual((presenter.presented, presenter.skipped), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()